@@ -1,36 +1,787 @@
 #!/usr/bin/env python3
 
-import argparse
+import copy
 import importlib
+import os
 from pathlib import Path
+import re
 import sys
+import time
+from types import ModuleType
+import typing
 
+# This module is imported by the test collector, and by every single puzzle run, so modules which are only needed by
+# some of its options are imported in the functions which use them.
+if typing.TYPE_CHECKING:
+    from collections.abc import Callable
+    from concurrent.futures import Executor
+    from multiprocessing.connection import Connection
 
-def run_puzzle(day: int, input_path: Path, part1: bool, **kwargs) -> int | str:
-    day_module = importlib.import_module(f"day{day:02}.day{day:02}")
-    data = day_module.load(input_path)
-    if part1:
-        return day_module.part1(data, **kwargs)
+top_dir = Path(__file__).resolve().parent
+cache_dir = top_dir / ".aoc_cache"
+day_regex = re.compile(r"day(\d{2})")
+sample_regex = re.compile(r"sample\d+")
+
+ResultType = int | str
+ExtraArgsType = dict[str, int | str]
+
+# Default maximum total size of the parsed input cache, in bytes.
+default_input_cache_limit = 256 * 1024 * 1024
+# Modules imported by more than one day.
+shared_module_paths = [top_dir / "grid.py"]
+
+
+def try_convert_int(s: str) -> int | str:
+    """If s contains only digits, return the integer it represents, otherwise just return s."""
+    if s.isdigit():
+        return int(s)
+    return s
+
+
+def find_days() -> list[int]:
+    """Return the numbers of all days with a puzzle directory, in order."""
+    return [int(day_match.group(1)) for day_dir in sorted(top_dir.iterdir())
+            if (day_match := day_regex.fullmatch(day_dir.name))]
+
+
+def find_inputs(day: int) -> list[Path]:
+    """Return the sample inputs for a day in order, followed by the main puzzle input (which may not exist)."""
+    data_dir = top_dir / f"day{day:02}" / "data"
+    return sorted([p for p in data_dir.iterdir() if sample_regex.fullmatch(p.name)]) + [data_dir / "input"]
+
+
+def find_answers(input_path: Path, part1: bool) -> list[tuple[ExtraArgsType, ResultType]]:
+    """
+    Return the known answers for one part of a puzzle input, as a list of (extra_args, answer).
+    Each line of an answer file is either just the answer, or of the form "arg_name=value,...: answer".
+    """
+    answer_file = input_path.parent / f"{input_path.name}.answer{1 if part1 else 2}"
+    if not answer_file.exists():
+        return []
+
+    result = []
+    with open(answer_file) as f:
+        for answer_line in f.readlines():
+            answer_line = answer_line.strip()
+            if ": " in answer_line:
+                extra_args = {extra_arg.split("=")[0]: try_convert_int(extra_arg.split("=")[1])
+                              for extra_arg in answer_line.split(": ")[0].split(",")}
+                answer = answer_line.split(": ")[1]
+            else:
+                extra_args = {}
+                answer = answer_line
+            result.append((extra_args, try_convert_int(answer)))
+    return result
+
+
+def case_name(day: int, input_path: Path, part1: bool, extra_args: ExtraArgsType) -> str:
+    """Name of a puzzle run with a known answer, as used for test ids and benchmark cases."""
+    input_name = "main" if input_path.name == "input" else input_path.name
+    return f"day{day:02} part{1 if part1 else 2}: {input_name}" + (" " + str(extra_args) if extra_args else "")
+
+
+def import_day(day: int) -> ModuleType:
+    return importlib.import_module(f"day{day:02}.day{day:02}")
+
+
+def file_hash(path: Path) -> str:
+    import hashlib
+
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def module_hash(day: int) -> str:
+    """
+    Hash of the source of a day's module (and any helper modules alongside it, or shared between days), along with the
+    Python version, to detect when data cached from that module may no longer be valid.
+    """
+    import hashlib
+
+    h = hashlib.sha256(sys.version.encode())
+    for source_path in sorted((top_dir / f"day{day:02}").glob("*.py")) + shared_module_paths:
+        h.update(source_path.name.encode())
+        h.update(source_path.read_bytes())
+    return h.hexdigest()
+
+
+# Prefix of cache files which are still being written.
+temp_file_prefix = ".tmp-"
+
+
+def evict_cache(directory: Path, limit: int) -> None:
+    """Delete the least recently used files from a cache directory, until its total size is within limit bytes."""
+    entries = []
+    for path in directory.iterdir():
+        if path.name.startswith(temp_file_prefix):
+            # Still being written by write_cache_file(), possibly in another process.
+            continue
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            # Removed by another process.
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum([size for _, size, _ in entries])
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        path.unlink(missing_ok=True)
+        total -= size
+
+
+def write_cache_file(path: Path, contents: bytes) -> None:
+    """Atomically write a cache file, so that concurrent runs never see a partially written file."""
+    import tempfile
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=temp_file_prefix)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(contents)
+        os.replace(temp_path, path)
+    except BaseException:
+        Path(temp_path).unlink(missing_ok=True)
+        raise
+
+
+def load_cached(day: int, input_path: Path, limit: int = default_input_cache_limit) -> typing.Any:
+    """
+    Load a puzzle input through the day's load() function, caching the parsed result as a pickle.
+    Cache entries are keyed by day, input file contents, and the day's module source, so editing either the input or
+    the puzzle code invalidates them. The cache is limited to limit bytes in total, evicting least recently used
+    entries first. Inputs which load() parses into unpicklable objects are never cached.
+    """
+    import pickle
+
+    input_cache_dir = cache_dir / "inputs"
+    cache_path = input_cache_dir / f"day{day:02}-{file_hash(input_path)[:32]}-{module_hash(day)[:16]}.pickle"
+    try:
+        with open(cache_path, "rb") as f:
+            data = pickle.load(f)
+        # Update modification time, which is used to find the least recently used entries.
+        os.utime(cache_path)
+        return data
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        # Corrupt or stale entry. It'll be replaced below.
+        pass
+
+    data = import_day(day).load(input_path)
+    try:
+        pickled = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return data
+    if len(pickled) <= limit:
+        write_cache_file(cache_path, pickled)
+        evict_cache(input_cache_dir, limit)
+    return data
+
+
+def accepts_executor(part: "Callable") -> bool:
+    """True if a puzzle part can run its own parallel tasks on a given executor, rather than creating its own."""
+    import inspect
+
+    return "executor" in inspect.signature(part).parameters
+
+
+class PuzzleTimings(typing.NamedTuple):
+    # Stage timings in nanoseconds. For runs stopped by run_puzzle_supervised(), stages that weren't reached are None.
+    import_ns: int | None
+    load_ns: int | None
+    solve_ns: int | None
+    # Peak memory allocated by Python during each stage in bytes, or None if memory wasn't traced.
+    load_peak_memory: int | None
+    solve_peak_memory: int | None
+
+
+def run_puzzle_timed(day: int, input_path: Path, part1: bool, extra_args: ExtraArgsType,
+                     profile_path: Path | None = None, trace_memory: bool = False,
+                     executor: "Executor | None" = None,
+                     input_cache_limit: int | None = None,
+                     stream: bool = False) -> tuple[ResultType, PuzzleTimings]:
+    """
+    Run a puzzle, timing the import, load, and solve stages separately.
+    If executor is given, it's shared with puzzles which run parallel tasks, rather than them creating their own.
+    If input_cache_limit is given, parsed inputs are loaded through a cache of at most that many bytes.
+    If stream is set, the input is read incrementally through the day's iter_load() generator rather than load(). The
+    input is then parsed as the puzzle consumes it, so parsing time is counted as solve time.
+    If profile_path is given, the solve stage is run under cProfile, and the stats are saved to that file.
+    If trace_memory is set, peak memory usage is measured with tracemalloc. This slows down the puzzle considerably,
+    so timings taken at the same time aren't representative.
+    """
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+
+    start = time.perf_counter_ns()
+    day_module = import_day(day)
+    import_ns = time.perf_counter_ns() - start
+
+    if trace_memory:
+        tracemalloc.reset_peak()
+    start = time.perf_counter_ns()
+    if stream:
+        data = day_module.iter_load(input_path)
+    elif input_cache_limit is not None:
+        data = load_cached(day, input_path, input_cache_limit)
     else:
-        return day_module.part2(data, **kwargs)
+        data = day_module.load(input_path)
+    load_ns = time.perf_counter_ns() - start
+    load_peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+
+    if trace_memory:
+        tracemalloc.reset_peak()
+    part = day_module.part1 if part1 else day_module.part2
+    if executor is not None and accepts_executor(part):
+        extra_args = extra_args | {"executor": executor}
+    profile = None
+    if profile_path is not None:
+        import cProfile
+        profile = cProfile.Profile()
+    start = time.perf_counter_ns()
+    if profile is not None:
+        profile.enable()
+    try:
+        result = part(data, **extra_args)
+    finally:
+        if profile is not None:
+            profile.disable()
+        solve_ns = time.perf_counter_ns() - start
+        solve_peak_memory = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+
+    if profile is not None:
+        profile.dump_stats(profile_path)
+
+    return result, PuzzleTimings(import_ns, load_ns, solve_ns, load_peak_memory, solve_peak_memory)
+
+
+class BudgetExceeded(Exception):
+    """A supervised puzzle run was stopped for exceeding its time or memory budget."""
+
+    def __init__(self, budget: str, limit: str, stage: str, timings: PuzzleTimings):
+        stages = ", ".join([f"{name} {format_ms(ns)} ms" for name, ns in
+                            [("import", timings.import_ns), ("load", timings.load_ns), ("solve", timings.solve_ns)]
+                            if ns is not None])
+        super().__init__(f"Exceeded {budget} budget of {limit} during {stage} stage ({stages})")
+        # Either "time" or "memory".
+        self.budget = budget
+        self.timings = timings
+
+
+def supervised_worker(conn: "Connection", day: int, input_path: Path, part1: bool, extra_args: ExtraArgsType,
+                      memory_limit: int | None, input_cache_limit: int | None, stream: bool,
+                      data: typing.Any) -> None:
+    """
+    Body of the worker process started by run_puzzle_supervised().
+    Sends ("import_ns", ns) and ("load_ns", ns) as each stage finishes, then one of ("result", result, solve_ns),
+    ("memory", ns) if the memory limit was reached, or ("error", exception).
+    """
+    # Put the worker (and any worker pools it creates) in its own process group, so they can all be killed together.
+    os.setpgrp()
+    if memory_limit is not None:
+        import resource
+        # Limits are inherited by any worker processes the puzzle creates, so each is limited separately.
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    start = time.perf_counter_ns()
+    try:
+        day_module = import_day(day)
+        conn.send(("import_ns", time.perf_counter_ns() - start))
+
+        if data is None:
+            start = time.perf_counter_ns()
+            if stream:
+                data = day_module.iter_load(input_path)
+            elif input_cache_limit is not None:
+                data = load_cached(day, input_path, input_cache_limit)
+            else:
+                data = day_module.load(input_path)
+            conn.send(("load_ns", time.perf_counter_ns() - start))
+
+        part = day_module.part1 if part1 else day_module.part2
+        start = time.perf_counter_ns()
+        result = part(data, **extra_args)
+        conn.send(("result", result, time.perf_counter_ns() - start))
+    except MemoryError:
+        conn.send(("memory", time.perf_counter_ns() - start))
+    except Exception as e:
+        try:
+            conn.send(("error", e))
+        except Exception:
+            # The exception itself can't be pickled.
+            conn.send(("error", RuntimeError(repr(e))))
+    finally:
+        conn.close()
+
+
+def run_puzzle_supervised(day: int, input_path: Path, part1: bool, extra_args: ExtraArgsType,
+                          time_limit: float | None = None, memory_limit: int | None = None,
+                          input_cache_limit: int | None = None, stream: bool = False,
+                          data: typing.Any = None, start_method: str | None = None) -> tuple[ResultType, PuzzleTimings]:
+    """
+    Run a puzzle in a separate worker process, stopping it if it runs for longer than time_limit seconds in total, or
+    allocates more than memory_limit bytes of address space. Raises BudgetExceeded if either limit is reached, with
+    the timings of the stages completed so far, and of the stage that was stopped.
+    If data is given, it's used instead of loading the input. With the fork start method the worker inherits it without
+    copying, and with other start methods it's pickled and sent to the worker.
+    start_method is the multiprocessing start method of the worker, or None for the default. Callers running puzzles
+    from several threads at once should use a method other than fork, as forking a multithreaded process is unsafe.
+    Exceptions raised by the puzzle are re-raised here. Puzzles which run parallel tasks create their own worker pool
+    within the worker process, as a pool can't be shared with it.
+    """
+    import contextlib
+    import multiprocessing
+    import signal
+
+    context = multiprocessing.get_context(start_method)
+    recv_conn, send_conn = context.Pipe(duplex=False)
+    process = context.Process(target=supervised_worker,
+                              args=(send_conn, day, input_path, part1, extra_args, memory_limit, input_cache_limit,
+                                    stream, data))
+    stages = ["import_ns", "load_ns", "solve_ns"] if data is None else ["import_ns", "solve_ns"]
+    timings: dict[str, int | None] = {"import_ns": None, "load_ns": None, "solve_ns": None}
+    start = time.perf_counter_ns()
+    deadline = None if time_limit is None else start + int(time_limit * 1_000_000_000)
+    stage_start = start
+    process.start()
+    send_conn.close()
+    try:
+        while True:
+            current_stage = stages[len([stage for stage in stages if timings[stage] is not None])]
+            timeout = None if deadline is None else max(0, deadline - time.perf_counter_ns()) / 1_000_000_000
+            if not recv_conn.poll(timeout):
+                timings[current_stage] = time.perf_counter_ns() - stage_start
+                raise BudgetExceeded("time", f"{time_limit} s", current_stage.removesuffix("_ns"),
+                                     PuzzleTimings(**timings, load_peak_memory=None, solve_peak_memory=None))
+            try:
+                message = recv_conn.recv()
+            except EOFError:
+                process.join()
+                raise RuntimeError(f"Worker for day{day:02} part{1 if part1 else 2} exited unexpectedly, with exit "
+                                   f"code {process.exitcode}") from None
+            stage_start = time.perf_counter_ns()
+            match message:
+                case ("result", result, solve_ns):
+                    timings["solve_ns"] = solve_ns
+                    return result, PuzzleTimings(**timings, load_peak_memory=None, solve_peak_memory=None)
+                case ("memory", ns):
+                    timings[current_stage] = ns
+                    raise BudgetExceeded("memory", f"{memory_limit / 1024 / 1024:.0f} MiB",
+                                         current_stage.removesuffix("_ns"),
+                                         PuzzleTimings(**timings, load_peak_memory=None, solve_peak_memory=None))
+                case ("error", e):
+                    raise e
+                case (stage, ns):
+                    timings[stage] = ns
+    finally:
+        recv_conn.close()
+        if process.is_alive():
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(process.pid, signal.SIGKILL)
+            process.kill()
+        process.join()
+
+
+def result_cache_path(day: int, input_path: Path, part1: bool, extra_args: ExtraArgsType) -> Path:
+    """
+    Path of the cached result of a puzzle.
+    Keyed by everything which can affect the result: day, part, input file contents, extra arguments, and the day's
+    module source.
+    """
+    import hashlib
+    import json
+
+    key = json.dumps([day, part1, file_hash(input_path), sorted(extra_args.items()), module_hash(day)])
+    return cache_dir / "results" / f"day{day:02}-{hashlib.sha256(key.encode()).hexdigest()[:32]}.pickle"
+
+
+def run_puzzle(day: int, input_path: Path, part1: bool, executor: "Executor | None" = None,
+               use_result_cache: bool = False, stream: bool = False, time_limit: float | None = None,
+               memory_limit: int | None = None, **kwargs) -> ResultType:
+    """
+    Run a puzzle, and return its result.
+    If use_result_cache is set, a previous result is returned if neither the input nor the day's module have changed
+    since it was calculated.
+    If stream is set, the input is read incrementally with the day's iter_load().
+    If time_limit (in seconds) or memory_limit (in bytes) are given, the puzzle is run with run_puzzle_supervised(),
+    and BudgetExceeded is raised if it goes over either. The executor isn't used in that case.
+    """
+    def run() -> ResultType:
+        if time_limit is not None or memory_limit is not None:
+            return run_puzzle_supervised(day, input_path, part1, kwargs, time_limit, memory_limit, stream=stream)[0]
+        return run_puzzle_timed(day, input_path, part1, kwargs, executor=executor, stream=stream)[0]
+
+    if not use_result_cache:
+        return run()
+
+    import pickle
+
+    cache_path = result_cache_path(day, input_path, part1, kwargs)
+    try:
+        with open(cache_path, "rb") as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        pass
+    except (pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+        # Corrupt entry. It'll be replaced below.
+        pass
+    result = run()
+    # Pickled rather than stored as JSON, as some puzzles return numeric types other than int.
+    write_cache_file(cache_path, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    return result
+
+
+def import_times(modules: list[str]) -> list[tuple[str, int, int, int]]:
+    """
+    Import modules in a fresh interpreter with python -X importtime, and return (module, depth, self_us,
+    cumulative_us) for every module imported. As with -X importtime, modules are listed in the order that their imports
+    finished, so each module comes after any modules it imported.
+    """
+    import subprocess
+
+    completed = subprocess.run([sys.executable, "-X", "importtime", "-c", "; ".join([f"import {m}" for m in modules])],
+                               cwd=top_dir, capture_output=True, text=True, check=True)
+    line_regex = re.compile(r"import time: +(\d+) \| +(\d+) \| ( *)(\S+)")
+    return [(match.group(4), len(match.group(3)) // 2, int(match.group(1)), int(match.group(2)))
+            for match in map(line_regex.fullmatch, completed.stderr.splitlines()) if match]
+
+
+def print_import_times(day: int, top: int = 5) -> None:
+    """
+    Report the cold-start import time of the runner and a day's module, along with the slowest modules directly
+    imported by each.
+    """
+    modules = ["aoc2023", f"day{day:02}.day{day:02}"]
+    # List of modules directly imported by the next top level module.
+    children: list[tuple[str, int]] = []
+    for module, depth, self_us, cumulative_us in import_times(modules):
+        if depth == 1:
+            children.append((module, cumulative_us))
+        elif depth == 0:
+            if module in modules:
+                print(f"Import {module}: {cumulative_us / 1000:.1f} ms", file=sys.stderr)
+                for child, child_us in sorted(children, key=lambda x: x[1], reverse=True)[:top]:
+                    print(f"    {child}: {child_us / 1000:.1f} ms", file=sys.stderr)
+            children = []
+
+
+def print_timings(timings: PuzzleTimings) -> None:
+    def format_memory(b: int | None) -> str:
+        return "" if b is None else f" (peak memory {b / 1024 / 1024:.1f} MiB)"
+
+    print(f"Import: {format_ms(timings.import_ns)} ms", file=sys.stderr)
+    print(f"Load:   {format_ms(timings.load_ns)} ms{format_memory(timings.load_peak_memory)}", file=sys.stderr)
+    print(f"Solve:  {format_ms(timings.solve_ns)} ms{format_memory(timings.solve_peak_memory)}", file=sys.stderr)
+
+
+class BatchResult(typing.NamedTuple):
+    day: int
+    part1: bool
+    input_path: Path
+    extra_args: ExtraArgsType
+    # None if the puzzle raised an exception.
+    result: ResultType | None
+    # None if there is no known answer.
+    answer: ResultType | None
+    # Stage timings in nanoseconds. Import and load times are only set on the first result that incurred them.
+    import_ns: int | None
+    load_ns: int | None
+    solve_ns: int
+    # "time" or "memory" if the puzzle was stopped for exceeding that budget.
+    exceeded: str | None = None
+
+
+# Result (None on error), solve time in nanoseconds, and the budget exceeded (if any) of a single batch run.
+BatchOutcomeType = tuple[ResultType | None, int, str | None]
+
+
+def solve(day: int, part1: bool, data: typing.Any, extra_args: ExtraArgsType,
+          executor: "Executor | None" = None) -> BatchOutcomeType:
+    """
+    Solve one part of a puzzle from already loaded data.
+    This is a module-level function so that it can be run on a process pool.
+    """
+    day_module = import_day(day)
+    part = day_module.part1 if part1 else day_module.part2
+    if executor is not None and accepts_executor(part):
+        extra_args = extra_args | {"executor": executor}
+    start = time.perf_counter_ns()
+    try:
+        result = part(data, **extra_args)
+    except Exception as e:
+        print(f"day{day:02} part{1 if part1 else 2}: {e!r}", file=sys.stderr)
+        result = None
+    return result, time.perf_counter_ns() - start, None
+
+
+def solve_supervised(day: int, input_path: Path, part1: bool, data: typing.Any, extra_args: ExtraArgsType,
+                     time_limit: float | None, memory_limit: int | None,
+                     start_method: str | None = None) -> BatchOutcomeType:
+    """As solve(), but within a time and memory budget, using run_puzzle_supervised()."""
+    try:
+        result, timings = run_puzzle_supervised(day, input_path, part1, extra_args, time_limit, memory_limit,
+                                                data=data, start_method=start_method)
+        return result, timings.solve_ns, None
+    except BudgetExceeded as e:
+        print(f"day{day:02} part{1 if part1 else 2}: {e}", file=sys.stderr)
+        return None, e.timings.solve_ns or 0, e.budget
+    except Exception as e:
+        print(f"day{day:02} part{1 if part1 else 2}: {e!r}", file=sys.stderr)
+        return None, 0, None
+
+
+def run_batch(days: list[int], parts: list[bool], samples: bool,
+              executor: "Executor | None" = None, input_cache_limit: int | None = None,
+              time_limit: float | None = None, memory_limit: int | None = None,
+              jobs: int | None = None) -> list[BatchResult]:
+    """
+    Run many puzzles in a single process.
+    Each day's module is imported once, and each input is loaded once and shared between all runs on that input.
+    Sample inputs are only run for parts with a known answer, as samples are often only valid for one part.
+    If executor is given, runs are solved concurrently. Parts which accept an executor are run on a thread in this
+    process, and share the executor for their own parallel tasks. All other parts are run on the executor itself.
+    If input_cache_limit is given, parsed inputs are loaded through a cache of at most that many bytes.
+    If time_limit (in seconds) or memory_limit (in bytes) are given, each run is solved in its own supervised worker
+    process, and stopped if it exceeds either. If jobs is also given, up to that many supervised runs (or one per CPU
+    if jobs is 0) are run at once, each started from a forkserver rather than forked from this multithreaded process.
+    Supervised runs never use executor.
+    """
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+    supervised = time_limit is not None or memory_limit is not None
+    # List of (result with outcome still to be filled in, outcome or a future for it).
+    pending: list[tuple[BatchResult, BatchOutcomeType | Future]] = []
+    concurrent_supervised = supervised and jobs is not None
+    with ThreadPoolExecutor((jobs or os.cpu_count()) if concurrent_supervised else None) as thread_pool:
+        for day in days:
+            start = time.perf_counter_ns()
+            day_module = import_day(day)
+            import_ns = time.perf_counter_ns() - start
+
+            for input_path in find_inputs(day):
+                is_sample = input_path.name != "input"
+                if (is_sample and not samples) or not input_path.exists():
+                    continue
+                # List of (part1, extra_args, answer) to run on this input.
+                runs = [(part1, extra_args, answer) for part1 in parts for extra_args, answer in
+                        (find_answers(input_path, part1) or ([] if is_sample else [({}, None)]))]
+                if not runs:
+                    continue
+
+                start = time.perf_counter_ns()
+                data = day_module.load(input_path) if input_cache_limit is None else \
+                    load_cached(day, input_path, input_cache_limit)
+                load_ns = time.perf_counter_ns() - start
+
+                for part1, extra_args, answer in runs:
+                    batch_result = BatchResult(day, part1, input_path, extra_args, None, answer, import_ns, load_ns, 0)
+                    # Some puzzles modify their input data, so each run gets its own copy.
+                    # Data sent to a worker process is copied anyway.
+                    if supervised:
+                        if concurrent_supervised:
+                            outcome = thread_pool.submit(solve_supervised, day, input_path, part1, data, extra_args,
+                                                         time_limit, memory_limit, "forkserver")
+                        else:
+                            outcome = solve_supervised(day, input_path, part1, data, extra_args, time_limit,
+                                                       memory_limit)
+                    elif executor is None:
+                        outcome = solve(day, part1, copy.deepcopy(data), extra_args)
+                    elif accepts_executor(day_module.part1 if part1 else day_module.part2):
+                        outcome = thread_pool.submit(solve, day, part1, copy.deepcopy(data), extra_args, executor)
+                    else:
+                        outcome = executor.submit(solve, day, part1, data, extra_args)
+                    pending.append((batch_result, outcome))
+                    import_ns = None
+                    load_ns = None
+
+        results = []
+        for batch_result, outcome in pending:
+            if isinstance(outcome, Future):
+                try:
+                    outcome = outcome.result()
+                except Exception as e:
+                    # Failures outside of the puzzle itself, such as data which can't be sent to a worker process.
+                    print(f"day{batch_result.day:02} part{1 if batch_result.part1 else 2}: {e!r}", file=sys.stderr)
+                    outcome = (None, 0, None)
+            results.append(batch_result._replace(result=outcome[0], solve_ns=outcome[1], exceeded=outcome[2]))
+
+    return results
+
+
+def format_ms(ns: int | None) -> str:
+    return "" if ns is None else f"{ns / 1_000_000:.1f}"
+
+
+def print_batch_results(results: list[BatchResult]) -> None:
+    def status(r: BatchResult) -> str:
+        if r.exceeded is not None:
+            return f"over {r.exceeded} budget"
+        if r.result is None:
+            return "error"
+        if r.answer is None:
+            return ""
+        return "✔" if r.result == r.answer else "✘"
+
+    headings = ["Day", "Part", "Input", "Result", "Check", "Import (ms)", "Load (ms)", "Solve (ms)"]
+    rows = [[str(r.day), str(1 if r.part1 else 2),
+             r.input_path.name + (" " + ",".join(f"{k}={v}" for k, v in r.extra_args.items()) if r.extra_args else ""),
+             "" if r.result is None else str(r.result), status(r),
+             format_ms(r.import_ns), format_ms(r.load_ns), format_ms(r.solve_ns)] for r in results]
+    rows.append(["Total", "", "", "", "",
+                 format_ms(sum([r.import_ns or 0 for r in results])),
+                 format_ms(sum([r.load_ns or 0 for r in results])),
+                 format_ms(sum([r.solve_ns for r in results]))])
+
+    widths = [max([len(row[i]) for row in rows + [headings]]) for i in range(len(headings))]
+    # Left-align text columns, right-align numeric columns.
+    for row in [headings] + rows:
+        print("  ".join([cell.ljust(width) if i < 5 else cell.rjust(width)
+                         for i, (cell, width) in enumerate(zip(row, widths))]).rstrip())
+
+
+def parse_days(s: str) -> list[int]:
+    """Parse a list of days, of the form "1-5,8,10-12"."""
+    import argparse
+
+    days = []
+    for part in s.split(","):
+        if match := re.fullmatch(r"(\d+)-(\d+)", part):
+            days += list(range(int(match.group(1)), int(match.group(2)) + 1))
+        elif part.isdigit():
+            days.append(int(part))
+        else:
+            raise argparse.ArgumentTypeError(f"'{s}' isn't a list of days, e.g. 1-5,8")
+    return days
 
 
 if __name__ == "__main__":
+    import argparse
+    import contextlib
+
     parser = argparse.ArgumentParser()
     parser.add_argument("-1", "--part1", action="store_true")
     parser.add_argument("-2", "--part2", action="store_true")
-    parser.add_argument("day", type=int, help="A number from 1-25 indicating the day of the puzzle to run")
-    parser.add_argument("input", type=Path, help="Path to the file containing puzzle input")
+    parser.add_argument("day", type=int, nargs="?", help="A number from 1-25 indicating the day of the puzzle to run")
+    parser.add_argument("input", type=Path, nargs="?", help="Path to the file containing puzzle input")
     parser.add_argument("-e", "--extra-arg", type=str,
                         help="An extra argument for the puzzle, in the form arg_name=value",
                         action="append", default=[])
+    batch_group = parser.add_mutually_exclusive_group()
+    batch_group.add_argument("-a", "--all", action="store_true",
+                             help="Batch mode: run both parts of every day on its puzzle input")
+    batch_group.add_argument("-d", "--days", type=parse_days,
+                             help="Batch mode: run both parts of the given days (e.g. 1-5,8) on their puzzle inputs")
+    parser.add_argument("-s", "--samples", action="store_true",
+                        help="In batch mode, also run sample inputs which have known answers")
+    parser.add_argument("-j", "--jobs", type=int, nargs="?", const=0,
+                        help="Use a shared pool of this many worker processes (default: one per CPU) for parallel "
+                             "puzzles, and in batch mode, run puzzles concurrently on it")
+    parser.add_argument("-c", "--cache-inputs", type=float, nargs="?", const=default_input_cache_limit / 1024 / 1024,
+                        metavar="LIMIT_MIB",
+                        help=f"Cache parsed inputs in {cache_dir.name}, keeping at most LIMIT_MIB MiB "
+                             f"(default: {default_input_cache_limit // 1024 // 1024})")
+    parser.add_argument("--stream", action="store_true",
+                        help="Read the input incrementally with the day's iter_load(), for days which support it")
+    parser.add_argument("--time-limit", type=float, metavar="SECONDS",
+                        help="Stop the puzzle if it runs for longer than this, running it in a supervised worker "
+                             "process")
+    parser.add_argument("--memory-limit", type=float, metavar="MIB",
+                        help="Stop the puzzle if it allocates more than this much address space, running it in a "
+                             "supervised worker process")
+    parser.add_argument("-r", "--result-cache", action="store_true",
+                        help=f"Reuse the result of a previous run from {cache_dir.name}, if neither the input nor the "
+                             f"puzzle code have changed")
+    parser.add_argument("-i", "--import-time", action="store_true",
+                        help="Report the cold-start import time of the runner and the day's module, and their slowest "
+                             "imports (on stderr)")
+    parser.add_argument("-t", "--timing", action="store_true",
+                        help="Report import, load, and solve times separately (on stderr)")
+    parser.add_argument("-p", "--profile", type=Path,
+                        help="Run the solve stage under cProfile, and save the stats to this file")
+    parser.add_argument("-m", "--trace-memory", action="store_true",
+                        help="Report peak memory usage of the load and solve stages (slows down the puzzle)")
     args = parser.parse_args()
+    input_cache_limit = None if args.cache_inputs is None else int(args.cache_inputs * 1024 * 1024)
+    memory_limit = None if args.memory_limit is None else int(args.memory_limit * 1024 * 1024)
+    supervised = args.time_limit is not None or memory_limit is not None
+
+    if args.all or args.days:
+        if args.day is not None or args.input is not None:
+            sys.exit("Day and input can't be given in batch mode.")
+        if args.extra_arg:
+            sys.exit("Extra arguments can't be given in batch mode, use answer files instead.")
+        if args.profile or args.trace_memory or args.result_cache or args.import_time or args.stream:
+            sys.exit("Profiling, memory tracing, import time reports, result caching, and streaming aren't supported "
+                     "in batch mode.")
+        batch_days = find_days() if args.all else args.days
+        batch_parts = [True, False] if args.part1 == args.part2 else [args.part1]
+        if args.jobs is None or supervised:
+            print_batch_results(run_batch(batch_days, batch_parts, args.samples,
+                                          input_cache_limit=input_cache_limit, time_limit=args.time_limit,
+                                          memory_limit=memory_limit, jobs=args.jobs))
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            with ProcessPoolExecutor(args.jobs or None) as shared_executor:
+                print_batch_results(run_batch(batch_days, batch_parts, args.samples, shared_executor,
+                                              input_cache_limit, args.time_limit, memory_limit))
+        sys.exit()
 
+    if args.day is None or args.input is None:
+        sys.exit("Day and input must be specified, unless running in batch mode.")
     if args.part1 == args.part2:
         sys.exit("Exactly one of --part1 or --part2 must be specified.")
     for ea in args.extra_arg:
         if "=" not in ea:
             sys.exit(f"Extra argument '{ea}' isn't of the form arg_name=value.")
-    extra_args = {k: int(v) if v.isdigit() else v for k, v in [i.split("=", 1) for i in args.extra_arg]}
+    extra_args = {k: try_convert_int(v) for k, v in [i.split("=", 1) for i in args.extra_arg]}
+
+    if args.result_cache and (args.timing or args.profile or args.trace_memory):
+        sys.exit("Timing, profiling, and memory tracing can't be combined with result caching.")
+    if supervised and (args.profile or args.trace_memory or args.jobs is not None):
+        sys.exit("Profiling, memory tracing, and shared worker pools can't be combined with time or memory limits.")
+    if args.stream:
+        if args.cache_inputs is not None:
+            sys.exit("Streamed inputs can't be cached.")
+        if not hasattr(import_day(args.day), "iter_load"):
+            sys.exit(f"Day {args.day} doesn't support streaming its input.")
+
+    # Only import the executor (and with it, multiprocessing) if it's needed.
+    if args.jobs is not None:
+        from concurrent.futures import ProcessPoolExecutor
+        shared_executor_context = ProcessPoolExecutor(args.jobs or None)
+    else:
+        shared_executor_context = contextlib.nullcontext()
+    with shared_executor_context as shared_executor:
+        try:
+            if args.result_cache:
+                print(str(run_puzzle(args.day, args.input, args.part1, shared_executor, True, args.stream,
+                                     args.time_limit, memory_limit, **extra_args)))
+                sys.exit()
+            if supervised:
+                result, puzzle_timings = run_puzzle_supervised(args.day, args.input, args.part1, extra_args,
+                                                               args.time_limit, memory_limit, input_cache_limit,
+                                                               args.stream)
+            else:
+                result, puzzle_timings = run_puzzle_timed(args.day, args.input, args.part1, extra_args,
+                                                          profile_path=args.profile, trace_memory=args.trace_memory,
+                                                          executor=shared_executor,
+                                                          input_cache_limit=input_cache_limit, stream=args.stream)
+        except BudgetExceeded as e:
+            sys.exit(str(e))
+    print(str(result))
+    if args.timing or args.trace_memory:
+        print_timings(puzzle_timings)
+    if args.import_time:
+        print_import_times(args.day)
+    if args.profile:
+        import pstats
 
-    print(str(run_puzzle(args.day, args.input, args.part1, **extra_args)))
+        pstats.Stats(str(args.profile), stream=sys.stderr).sort_stats("cumulative").print_stats(20)
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+
+# Benchmark runner, for the same puzzle inputs and answers found by test_aoc2023.py.
+# Usage:
+#     python bench_aoc2023.py                      # Benchmark everything, and compare against bench_baseline.json
+#     python bench_aoc2023.py -d 1-5 -k main       # Only benchmark main puzzle inputs for days 1-5
+#     python bench_aoc2023.py -n 10 -w 2           # 10 timed runs of each puzzle, after 2 warmup runs
+#     python bench_aoc2023.py --update-baseline    # Store these results as the new baseline
+
+import argparse
+import json
+import math
+import multiprocessing
+from multiprocessing.connection import Connection
+from pathlib import Path
+import platform
+import resource
+import statistics
+import sys
+import time
+import typing
+
+import aoc2023
+
+default_output = aoc2023.top_dir / "bench_results.json"
+default_baseline = aoc2023.top_dir / "bench_baseline.json"
+
+
+class BenchCase(typing.NamedTuple):
+    name: str
+    day: int
+    input_path: Path
+    part1: bool
+    answer: aoc2023.ResultType
+    extra_args: aoc2023.ExtraArgsType
+
+
+def find_cases(days: list[int]) -> list[BenchCase]:
+    """Find benchmark cases, named the same as their corresponding tests in test_aoc2023.py."""
+    cases = []
+    for day in days:
+        for input_path in aoc2023.find_inputs(day):
+            for part in [1, 2]:
+                for extra_args, answer in aoc2023.find_answers(input_path, part == 1):
+                    cases.append(BenchCase(aoc2023.case_name(day, input_path, part == 1, extra_args),
+                                           day, input_path, part == 1, answer, extra_args))
+    return cases
+
+
+def percentile(sorted_values: list[int], p: float) -> int:
+    """Nearest-rank percentile of an already sorted list."""
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def summarise(values: list[int]) -> dict[str, int]:
+    values = sorted(values)
+    return {"min_ns": values[0], "median_ns": int(statistics.median(values)), "p95_ns": percentile(values, 95)}
+
+
+def bench_case(case: BenchCase, runs: int, warmup: int, input_cache_limit: int | None, conn: Connection) -> None:
+    """
+    Run a single benchmark case, and send its results through conn.
+    Intended to be run in a fresh process, so that the peak RSS belongs to this case alone.
+    """
+    load_times = []
+    solve_times = []
+    correct = True
+    for i in range(warmup + runs):
+        result, timings = aoc2023.run_puzzle_timed(case.day, case.input_path, case.part1, case.extra_args,
+                                                     input_cache_limit=input_cache_limit)
+        correct = correct and result == case.answer
+        if i >= warmup:
+            load_times.append(timings.load_ns)
+            solve_times.append(timings.solve_ns)
+
+    conn.send({
+        "correct": correct,
+        "runs": runs,
+        "load": summarise(load_times),
+        "solve": summarise(solve_times),
+        # ru_maxrss is in KiB on Linux.
+        "peak_rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    })
+    conn.close()
+
+
+def run_benchmarks(cases: list[BenchCase], runs: int, warmup: int,
+                   input_cache_limit: int | None = None) -> dict[str, dict]:
+    results = {}
+    for case in cases:
+        print(f"{case.name} ...", end="", flush=True, file=sys.stderr)
+        recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=bench_case, args=(case, runs, warmup, input_cache_limit, send_conn))
+        process.start()
+        send_conn.close()
+        try:
+            results[case.name] = recv_conn.recv()
+            process.join()
+        except EOFError:
+            # Process died without sending results.
+            process.join()
+            results[case.name] = {"error": f"exit code {process.exitcode}"}
+        if "error" in results[case.name]:
+            print(f" {results[case.name]['error']}", file=sys.stderr)
+        else:
+            print(f" {aoc2023.format_ms(results[case.name]['solve']['median_ns'])} ms", file=sys.stderr)
+    return results
+
+
+def find_regressions(results: dict[str, dict], baseline: dict[str, dict], threshold: float,
+                     min_change_ns: int) -> list[str]:
+    """
+    Return descriptions of cases whose median solve time has increased by more than threshold (as a fraction) over the
+    baseline. Increases smaller than min_change_ns are ignored, as very short cases are dominated by noise.
+    Cases missing from either set of results are ignored.
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline or "solve" not in result or "solve" not in baseline[name]:
+            continue
+        old = baseline[name]["solve"]["median_ns"]
+        new = result["solve"]["median_ns"]
+        if new > old * (1 + threshold) and new - old >= min_change_ns:
+            regressions.append(f"{name}: {aoc2023.format_ms(old)} ms -> {aoc2023.format_ms(new)} ms "
+                               f"(+{(new / old - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_results(results: dict[str, dict]) -> None:
+    headings = ["Case", "OK", "Min (ms)", "Median (ms)", "p95 (ms)", "Load (ms)", "Peak RSS (MiB)"]
+    rows = [[name, "error" if "error" in r else ("✔" if r["correct"] else "✘")] +
+            (["", "", "", "", ""] if "error" in r else
+             [aoc2023.format_ms(r["solve"]["min_ns"]), aoc2023.format_ms(r["solve"]["median_ns"]),
+              aoc2023.format_ms(r["solve"]["p95_ns"]), aoc2023.format_ms(r["load"]["median_ns"]),
+              f"{r['peak_rss_kib'] / 1024:.1f}"])
+            for name, r in results.items()]
+    widths = [max([len(row[i]) for row in rows + [headings]]) for i in range(len(headings))]
+    for row in [headings] + rows:
+        print("  ".join([cell.ljust(width) if i < 2 else cell.rjust(width)
+                         for i, (cell, width) in enumerate(zip(row, widths))]).rstrip())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-d", "--days", type=aoc2023.parse_days, help="Only benchmark the given days, e.g. 1-5,8")
+    parser.add_argument("-k", "--filter", type=str, action="append", default=[],
+                        help="Only benchmark cases whose name contains this string (may be repeated)")
+    parser.add_argument("-n", "--runs", type=int, default=5, help="Number of timed runs of each case")
+    parser.add_argument("-w", "--warmup", type=int, default=1, help="Number of untimed runs before timing each case")
+    parser.add_argument("-c", "--cache-inputs", action="store_true",
+                        help="Load parsed inputs through the same cache as aoc2023.py --cache-inputs")
+    parser.add_argument("-o", "--output", type=Path, default=default_output, help="File to write JSON results to")
+    parser.add_argument("-b", "--baseline", type=Path, default=default_baseline,
+                        help="JSON results file to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Fractional increase in median solve time over the baseline to flag as a regression")
+    parser.add_argument("--min-change", type=float, default=1.0,
+                        help="Minimum increase in median solve time (in ms) to flag as a regression")
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Write these results to the baseline file, merged with any existing baseline results")
+    args = parser.parse_args()
+
+    if args.runs < 1:
+        sys.exit("At least one run is required.")
+
+    bench_cases = [case for case in find_cases(args.days or aoc2023.find_days())
+                   if all([f in case.name for f in args.filter])]
+    bench_results = run_benchmarks(bench_cases, args.runs, args.warmup,
+                                   aoc2023.default_input_cache_limit if args.cache_inputs else None)
+    print_results(bench_results)
+
+    output = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": bench_results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+
+    baseline_results = {}
+    if args.baseline.exists():
+        with open(args.baseline) as f:
+            baseline_results = json.load(f)["results"]
+
+    exit_code = 0
+    if args.update_baseline:
+        output["results"] = baseline_results | bench_results
+        with open(args.baseline, "w") as f:
+            json.dump(output, f, indent=2)
+    elif baseline_results:
+        if bench_regressions := find_regressions(bench_results, baseline_results, args.threshold,
+                                                  int(args.min_change * 1_000_000)):
+            print(f"\nRegressions over {args.threshold * 100:.0f}% against {args.baseline}:")
+            for regression in bench_regressions:
+                print(f"    {regression}")
+            exit_code = 1
+        else:
+            print(f"\nNo regressions over {args.threshold * 100:.0f}% against {args.baseline}.")
+    if not all([r.get("correct", False) for r in bench_results.values()]):
+        exit_code = 1
+    sys.exit(exit_code)
@@ -0,0 +1,7 @@
+def pytest_addoption(parser):
+    parser.addoption("--result-cache", action="store_true",
+                     help="Reuse answers from previous runs of puzzles whose input and code haven't changed")
+    parser.addoption("--time-limit", type=float, metavar="SECONDS",
+                     help="Fail puzzles which run for longer than this")
+    parser.addoption("--memory-limit", type=float, metavar="MIB",
+                     help="Fail puzzles which allocate more than this much address space")
@@ -1,36 +1,96 @@
 #!/usr/bin/env python3
 
+from collections.abc import Iterable, Iterator
+import mmap
 from pathlib import Path
 import re
 
-InputType = list[str]
+from grid import map_file
+
+# load() returns the whole input file as a buffer, and iter_load() a generator of its lines. Both parts accept either.
+InputType = bytes | mmap.mmap | Iterable[str]
 ResultType = int
 
 
-def load(input_path: Path) -> InputType:
+def iter_load(input_path: Path) -> Iterator[str]:
     with open(input_path) as f:
-        return [line.strip() for line in f.readlines()]
+        for line in f:
+            yield line.strip()
 
 
-def part1(input_data: InputType) -> ResultType:
-    def get_calibration_value(line: str) -> int:
-        digit_chars = [c for c in line if c.isdigit()]
-        return int(digit_chars[0] + digit_chars[-1])
+def load(input_path: Path) -> InputType:
+    return map_file(input_path)
+
+
+# Input size in bytes at which finding digits with NumPy is faster than with regexes, including the time to import
+# NumPy.
+numpy_min_bytes = 2_000_000
+
+# "zero" specifically omitted in problem description.
+digit_words = {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9}
+
+
+class CalibrationReader:
+    """
+    Finds the first and last digit of each line, where digits may also be spelled out as words.
+    A pair of regexes scan a whole buffer at once: a lazy match from the start of each line finds its first digit, and
+    a greedy one its last, including overlapping words such as the "eight" in "oneight". No line is copied or reversed.
+    """
 
-    return sum([get_calibration_value(line) for line in input_data])
+    def __init__(self, words: dict[str, int]):
+        patterns = {str(d).encode(): d for d in range(10)} | {w.encode(): v for w, v in words.items()}
+        self._values = patterns | {pattern.decode(): value for pattern, value in patterns.items()}
+        alternatives = b"|".join(map(re.escape, patterns))
+        self._first_regex = re.compile(rb"^[^\n]*?(" + alternatives + rb")", re.MULTILINE)
+        self._last_regex = re.compile(rb"^[^\n]*(" + alternatives + rb")", re.MULTILINE)
+        self._first_str_regex = re.compile(self._first_regex.pattern.decode(), re.MULTILINE)
+        self._last_str_regex = re.compile(self._last_regex.pattern.decode(), re.MULTILINE)
+
+    def total_calibration_value(self, buffer: bytes | mmap.mmap) -> int:
+        """Return the sum of calibration values of every line in buffer, such as the memory map of a whole file."""
+        # Lines without digits match neither regex, so the matches for each line pair up.
+        values = self._values
+        return sum(10 * values[first.group(1)] + values[last.group(1)]
+                   for first, last in zip(self._first_regex.finditer(buffer), self._last_regex.finditer(buffer)))
+
+    def total(self, input_data: InputType) -> int:
+        if isinstance(input_data, bytes | mmap.mmap):
+            return self.total_calibration_value(input_data)
+        values = self._values
+        total = 0
+        for line in input_data:
+            if first := self._first_str_regex.match(line):
+                total += 10 * values[first.group(1)] + values[self._last_str_regex.match(line).group(1)]
+        return total
+
+
+def total_calibration_value_numpy(buffer: bytes | mmap.mmap) -> int:
+    """
+    Return the sum of calibration values of every line in buffer, for digits only (not digit words).
+    The whole buffer is processed with vectorised operations, instead of one line at a time.
+    """
+    import numpy as np
+
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    digit_positions = np.flatnonzero((data >= ord("0")) & (data <= ord("9")))
+    if digit_positions.size == 0:
+        return 0
+    # Line number of each digit, found from the number of newlines before it.
+    newline_positions = np.flatnonzero(data == ord("\n"))
+    digit_lines = np.searchsorted(newline_positions, digit_positions)
+    # Digits are in order, so the first and last digits of each line are where the line number changes.
+    line_changes = digit_lines[1:] != digit_lines[:-1]
+    first_digits = data[digit_positions[np.concatenate(([True], line_changes))]]
+    last_digits = data[digit_positions[np.concatenate((line_changes, [True]))]]
+    return int(10 * (first_digits.sum(dtype=np.int64) - ord("0") * len(first_digits)) +
+               last_digits.sum(dtype=np.int64) - ord("0") * len(last_digits))
+
+
+def part1(input_data: InputType) -> ResultType:
+    if isinstance(input_data, bytes | mmap.mmap) and len(input_data) >= numpy_min_bytes:
+        return total_calibration_value_numpy(input_data)
+    return CalibrationReader({}).total(input_data)
 
 
 def part2(input_data: InputType) -> ResultType:
-    conversion_map = {str(x): x for x in range(10)} | \
-        {"one": 1, "two": 2, "three": 3, "four": 4, "five": 5, "six": 6, "seven": 7, "eight": 8, "nine": 9}
-    # "zero" specifically omitted in problem description.
-    first_regex = re.compile("|".join(conversion_map.keys()))
-    last_regex = re.compile("|".join(conversion_map.keys())[::-1])
-    # Need to search from the back of the string with a reversed regex.
-    # Can't just use re.split(), as this will miss the last match if it overlaps with a previous match.
-
-    def get_calibration_value(line: str) -> int:
-        return (conversion_map[first_regex.search(line).group(0)] * 10) + \
-            conversion_map[last_regex.search(line[::-1]).group(0)[::-1]]
-
-    return sum([get_calibration_value(line) for line in input_data])
+    return CalibrationReader(digit_words).total(input_data)
@@ -1,17 +1,58 @@
 #!/usr/bin/env python3
 
+from array import array
+from collections.abc import Iterable, Iterator
 import math
 from pathlib import Path
 import re
+import typing
 
-# Input is a dictionary of game ids, to games.
 # Each game is a list of sets of cubes revealed.
 # Cube counts are (red, green, blue).
-InputType = dict[int, list[tuple[int, int, int]]]
+GameType = list[tuple[int, int, int]]
+
+
+class GameLog(typing.NamedTuple):
+    """
+    Columnar store of many games.
+    The sets of cubes revealed in the game with id game_ids[i] are at [offsets[i]:offsets[i + 1]] in each of the red,
+    green, and blue columns.
+    """
+    game_ids: array
+    offsets: array
+    red: array
+    green: array
+    blue: array
+
+    @classmethod
+    def from_games(cls, games: Iterable[tuple[int, GameType]]) -> "GameLog":
+        log = cls(array("I"), array("I", [0]), array("H"), array("H"), array("H"))
+        for game_id, game_sets in games:
+            log.game_ids.append(game_id)
+            for r, g, b in game_sets:
+                log.red.append(r)
+                log.green.append(g)
+                log.blue.append(b)
+            log.offsets.append(len(log.red))
+        return log
+
+    def max_cubes(self) -> Iterator[tuple[int, int, int]]:
+        """Yield the maximum (red, green, blue) cube counts of each game, i.e. the minimum set of cubes it needs."""
+        offsets = self.offsets
+        for i in range(len(self.game_ids)):
+            start, end = offsets[i], offsets[i + 1]
+            if start == end:
+                yield 0, 0, 0
+            else:
+                yield max(self.red[start:end]), max(self.green[start:end]), max(self.blue[start:end])
+
+
+# Input is a GameLog from load(), or a sequence of (game id, game) from iter_load(). Both parts accept either.
+InputType = GameLog | Iterable[tuple[int, GameType]]
 ResultType = int
 
 
-def load(input_path: Path) -> InputType:
+def iter_load(input_path: Path) -> Iterator[tuple[int, GameType]]:
     def string_to_game_set(s: str) -> tuple[int, int, int]:
         r = 0
         g = 0
@@ -26,26 +67,48 @@ def load(input_path: Path) -> InputType:
                     b += int(count)
         return r, g, b
 
-    result: InputType = {}
     line_regex = re.compile(r"Game (?P<game_id>\d+): (?P<games>.*)")
 
     with open(input_path) as f:
         while line := f.readline().strip():
             match = line_regex.fullmatch(line)
             assert match
-            result[int(match.group("game_id"))] = list(map(string_to_game_set, match.group("games").split("; ")))
+            yield int(match.group("game_id")), list(map(string_to_game_set, match.group("games").split("; ")))
 
-    return result
+
+def load(input_path: Path) -> InputType:
+    return GameLog.from_games(iter_load(input_path))
+
+
+def max_cubes(input_data: InputType) -> Iterator[tuple[int, tuple[int, int, int]]]:
+    """
+    Yield the id and maximum (red, green, blue) cube counts of each game.
+    Games which aren't already in a GameLog are reduced one at a time as they're read, without storing them.
+    """
+    if isinstance(input_data, GameLog):
+        yield from zip(input_data.game_ids, input_data.max_cubes())
+        return
+    for game_id, game_sets in input_data:
+        yield game_id, tuple(map(max, zip(*game_sets))) if game_sets else (0, 0, 0)
+
+
+def possible_game_id_sums(input_data: InputType, limits: list[tuple[int, int, int]]) -> list[int]:
+    """
+    For each (red, green, blue) limit on the number of cubes in the bag, return the sum of ids of games which would
+    have been possible with that bag. All limits are evaluated in a single pass over the games.
+    """
+    totals = [0] * len(limits)
+    for game_id, (r, g, b) in max_cubes(input_data):
+        for i, (max_r, max_g, max_b) in enumerate(limits):
+            if r <= max_r and g <= max_g and b <= max_b:
+                totals[i] += game_id
+    return totals
 
 
 def part1(input_data: InputType) -> ResultType:
     max_balls = (12, 13, 14)
-    return sum([game_id for game_id, game_sets in input_data.items() if
-        all([all([a <= b for a, b in zip(game_set, max_balls)]) for game_set in game_sets])])
+    return possible_game_id_sums(input_data, [max_balls])[0]
 
 
 def part2(input_data: InputType) -> ResultType:
-    def get_min_set(sets: list[tuple[int, int, int]]) -> tuple[int, int, int]:
-        return tuple([max(x) for x in zip(*sets)])
-
-    return sum([math.prod(min_set) for min_set in map(get_min_set, input_data.values())])
+    return sum(math.prod(min_set) for _, min_set in max_cubes(input_data))
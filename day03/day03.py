@@ -1,65 +1,105 @@
 #!/usr/bin/env python3
 
+import bisect
+from collections.abc import Iterable, Iterator
+import itertools
 from pathlib import Path
 import re
+import typing
 
-# List of input file lines.
-InputType = list[str]
+from grid import Grid
+
+# load() returns a Grid, and iter_load() a generator of lines. Both parts accept either, as they only need to iterate
+# over rows.
+InputType = Grid | Iterable[str]
 ResultType = int
 
 
-def load(input_path: Path) -> InputType:
+def iter_load(input_path: Path) -> Iterator[str]:
     with open(input_path) as f:
-        return [line.strip() for line in f.readlines()]
-
-
-partnum_regex = re.compile(r"(?<![0-9])(\d+)(?![0-9])")
+        for line in f:
+            yield line.strip()
 
 
-def part1(input_data: InputType) -> ResultType:
-    height = len(input_data)
-    width = len(input_data[0])
-    total = 0
+def load(input_path: Path) -> InputType:
+    return Grid.from_file(input_path)
 
-    contains_symbol_regex = re.compile(r"[^0-9.]")
 
-    def symbol_nearby(row_start: int, row_end: int, col_start: int, col_end: int) -> bool:
-        """
-        *_start are inclusive, *_end are exclusive
-        """
-        for row in range(row_start, row_end):
-            if contains_symbol_regex.search(input_data[row][col_start:col_end]):
-                return True
-        return False
+partnum_regex = re.compile(r"(?<![0-9])(\d+)(?![0-9])")
+symbol_regex = re.compile(r"[^0-9.]")
+
+
+class RowNumbers(typing.NamedTuple):
+    """
+    Index of the part numbers in a single row, as parallel lists of their start columns, end columns (exclusive), and
+    values. Part numbers don't overlap, so both starts and ends are sorted.
+    """
+    starts: list[int]
+    ends: list[int]
+    values: list[int]
+
+
+def index_row(line: str) -> RowNumbers:
+    numbers = RowNumbers([], [], [])
+    for match in partnum_regex.finditer(line):
+        numbers.starts.append(match.start())
+        numbers.ends.append(match.end())
+        numbers.values.append(int(match.group(0)))
+    return numbers
+
+
+def adjacent_numbers(numbers: RowNumbers, col: int) -> range:
+    """
+    Return the indexes in numbers of the part numbers that would be adjacent (including diagonally) to a symbol in
+    column col of this row, or of the row above or below.
+    """
+    # Part numbers which overlap any of columns col-1 to col+1.
+    return range(bisect.bisect_left(numbers.ends, col), bisect.bisect_right(numbers.starts, col + 1))
+
+
+class WindowRow(typing.NamedTuple):
+    line: str
+    numbers: RowNumbers
+    # Non-zero for each part number found to be adjacent to a symbol.
+    counted: bytearray
+
+
+def scan_schematic(lines: Iterable[str]) -> tuple[int, int]:
+    """
+    Return the sum of part numbers adjacent to a symbol, and the sum of gear ratios, in a single pass over the rows
+    of a schematic.
+    Only a sliding window of three rows is kept, so memory use depends on the width of the schematic but not its
+    height. The symbols in each row are processed once the row after it has been read.
+    """
+    part_number_total = 0
+    gear_ratio_total = 0
+    window: list[WindowRow] = []
+    # A final None processes the symbols in the last row.
+    for line in itertools.chain(lines, [None]):
+        if line is not None:
+            numbers = index_row(line)
+            window.append(WindowRow(line, numbers, bytearray(len(numbers.values))))
+        centre = len(window) - 2 if line is not None else len(window) - 1
+        if centre >= 0:
+            neighbour_rows = window[max(0, centre - 1):centre + 2]
+            for match in symbol_regex.finditer(window[centre].line):
+                adjacent = [(row, i) for row in neighbour_rows for i in adjacent_numbers(row.numbers, match.start())]
+                for row, i in adjacent:
+                    row.counted[i] = 1
+                if match.group(0) == "*" and len(adjacent) == 2:
+                    gear_ratio_total += adjacent[0][0].numbers.values[adjacent[0][1]] * \
+                        adjacent[1][0].numbers.values[adjacent[1][1]]
+        # Rows leaving the window can't be adjacent to any more symbols.
+        retiring = window[:-2] if line is not None else window
+        for row in retiring:
+            part_number_total += sum(itertools.compress(row.numbers.values, row.counted))
+        del window[:len(retiring)]
+    return part_number_total, gear_ratio_total
 
-    for i, line in enumerate(input_data):
-        for match in partnum_regex.finditer(line):
-            if symbol_nearby(max(0, i-1), min(height, i+2), max(0, match.start()-1), min(width, match.end()+1)):
-                total += int(match.group(0))
 
-    return total
+def part1(input_data: InputType) -> ResultType:
+    return scan_schematic(input_data)[0]
 
 
 def part2(input_data: InputType) -> ResultType:
-    height = len(input_data)
-    width = len(input_data[0])
-    total = 0
-
-    # List of neighbourhoods, paired with their corresponding partnum integers.
-    # Neighbourhood is the area around a partnum, as (row_start, row_end, col_start, col_end).
-    # *_start is inclusive, *_end is exclusive.
-    partnum_neighbourhoods: list[tuple[tuple[int, int, int, int], int]] = []
-    for i, line in enumerate(input_data):
-        for match in partnum_regex.finditer(line):
-            partnum_neighbourhoods.append(((max(0, i-1), min(height, i+2),
-                                            max(0, match.start()-1), min(width, match.end()+1)),
-                                           int(match.group(0))))
-
-    for i, line in enumerate(input_data):
-        for j in [pos for pos, char in enumerate(line) if char == "*"]:
-            neighbours = list(filter(lambda x: (x[0][0] <= i < x[0][1] and x[0][2] <= j < x[0][3]),
-                                     partnum_neighbourhoods))
-            if len(neighbours) == 2:
-                total += neighbours[0][1] * neighbours[1][1]
-
-    return total
+    return scan_schematic(input_data)[1]
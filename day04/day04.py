@@ -1,44 +1,111 @@
 #!/usr/bin/env python3
 
+import collections
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 import re
-import sys
+import typing
 
-# Dictionary from game number to (winning numbers, your numbers)
-InputType = dict[int, tuple[set[int], set[int]]]
+# NumPy is only imported when loading a large table of cards, to keep startup fast.
+if typing.TYPE_CHECKING:
+    import numpy as np
+
+# (game number, winning numbers, your numbers)
+# Sets of numbers are bitmasks, with bit n set if n is in the set.
+CardType = tuple[int, int, int]
+
+
+class CardTable(typing.NamedTuple):
+    """
+    All cards, as NumPy arrays.
+    Sets of numbers are bitmasks split into 64-bit words, with one row of words per card.
+    """
+    game_nums: "np.ndarray"
+    winning: "np.ndarray"
+    yours: "np.ndarray"
+
+    def match_counts(self) -> "np.ndarray":
+        """Return the number of your numbers that are winning numbers, for every card at once."""
+        import numpy as np
+
+        return np.bitwise_count(self.winning & self.yours).sum(axis=1, dtype=np.int64)
+
+
+# Cards in order, either a sequence of cards from iter_load() (or load(), for smaller inputs), or a CardTable from load()
+# for large inputs. Both parts accept either.
+InputType = CardTable | Iterable[CardType]
 ResultType = int
 
+# Number of cards at which matching them all at once with NumPy is faster than one at a time, including the time to
+# import NumPy.
+numpy_min_cards = 1_000_000
 
-def load(input_path: Path) -> InputType:
-    line_regex = re.compile(r"Card +(?P<game_num>\d+):(?P<winning>[0-9 ]+)\|(?P<yours>[0-9 ]+)")
+line_regex = re.compile(r"Card +(?P<game_num>\d+):(?P<winning>[0-9 ]+)\|(?P<yours>[0-9 ]+)")
 
-    def parse_line(line: str) -> tuple[int, set[int], set[int]]:
+
+def iter_load(input_path: Path) -> Iterator[CardType]:
+    def parse_line(line: str) -> CardType:
         match = line_regex.fullmatch(line.strip())
-        return int(match.group("game_num")), \
-            set([int(x) for x in match.group("winning").split()]), \
-            set([int(x) for x in match.group("yours").split()])
+        winning = 0
+        for x in match.group("winning").split():
+            winning |= 1 << int(x)
+        yours = 0
+        for x in match.group("yours").split():
+            yours |= 1 << int(x)
+        return int(match.group("game_num")), winning, yours
 
     with open(input_path) as f:
-        return {game_num: (winning, yours) for game_num, winning, yours in map(parse_line, f.readlines())}
+        yield from map(parse_line, f)
 
 
-def part1(input_data: InputType) -> ResultType:
-    def card_value(winning: set[int], yours: set[int]) -> int:
-        winning_numbers = len(yours.intersection(winning))
-        return 0 if winning_numbers == 0 else 2 ** (winning_numbers - 1)
+def load(input_path: Path) -> InputType:
+    cards = list(iter_load(input_path))
+    if len(cards) < numpy_min_cards:
+        return cards
+
+    import numpy as np
+
+    words = max(max(winning.bit_length(), yours.bit_length()) for _, winning, yours in cards) // 64 + 1
+
+    def masks(column: int) -> np.ndarray:
+        return np.frombuffer(b"".join(card[column].to_bytes(8 * words, "little") for card in cards),
+                             dtype="<u8").reshape(len(cards), words).astype(np.uint64)
+
+    return CardTable(np.array([card[0] for card in cards], dtype=np.int64), masks(1), masks(2))
 
-    return sum([card_value(w, y) for w, y in input_data.values()])
+
+def match_counts(input_data: InputType) -> Iterable[int]:
+    """Return the number of your numbers that are winning numbers, for each card in order."""
+    if isinstance(input_data, CardTable):
+        return input_data.match_counts().tolist()
+    return ((winning & yours).bit_count() for _, winning, yours in input_data)
+
+
+def part1(input_data: InputType) -> ResultType:
+    if isinstance(input_data, CardTable):
+        counts = input_data.match_counts()
+        # Cards with no matches are worth 2**-1, which rounds down to 0.
+        return int((1 << counts >> 1).sum())
+    return sum((1 << count) >> 1 for count in match_counts(input_data))
 
 
 def part2(input_data: InputType) -> ResultType:
-    card_counts: dict[int, int] = {i: 1 for i in input_data.keys()}
-    # Dicts are insertion ordered as of Python 3.7, required here for our iteration through input_data.keys().
-    assert sys.version_info >= (3, 7)
+    # Difference array of the extra copies won by previous cards, for each of the cards following the current one.
+    # Winning copies of the next n cards adds to the first delta and subtracts from the n+1th, rather than updating all
+    # n counts.
+    # Cards only win copies of the next few cards, so this stays short however many cards there are.
+    # Copies won of cards past the end of the table are never used.
+    deltas: collections.deque[int] = collections.deque()
+    extra_copies = 0
+    total = 0
 
-    num_games = len(input_data)
-    for i in input_data.keys():
-        winning_numbers = len(input_data[i][1].intersection(input_data[i][0]))
-        for j in range(i + 1, min(num_games + 1, i + 1 + winning_numbers)):
-            card_counts[j] += card_counts[i]
+    for count in match_counts(input_data):
+        extra_copies += deltas.popleft() if deltas else 0
+        card_count = 1 + extra_copies
+        total += card_count
+        if count:
+            deltas.extend([0] * (count + 1 - len(deltas)))
+            deltas[0] += card_count
+            deltas[count] -= card_count
 
-    return sum(card_counts.values())
+    return total
@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 
+import bisect
 from pathlib import Path
 import re
-from typing import Self
+import typing
+
+# NumPy is only imported for large batches of seeds, to keep startup fast.
+if typing.TYPE_CHECKING:
+    import numpy as np
 
 # (destination range start, source range start, range length)
 SingleMappingType = tuple[int, int, int]
@@ -12,6 +17,10 @@ MapType = tuple[str, str, list[SingleMappingType]]
 InputType = tuple[list[int], list[MapType]]
 ResultType = int
 
+# Number of seeds at which looking up all of them at once with NumPy is faster than one at a time, including the time
+# to import NumPy.
+numpy_min_seeds = 100_000
+
 
 def load(input_path: Path) -> InputType:
     seeds: list[int]
@@ -39,118 +48,98 @@ def load(input_path: Path) -> InputType:
     return seeds, maps
 
 
-def part1(input_data: InputType) -> ResultType:
-    def apply_map(start_val: int, mapping: MapType) -> int:
-        for mapping_line in mapping[2]:
-            if mapping_line[1] <= start_val < mapping_line[1] + mapping_line[2]:
-                return start_val - mapping_line[1] + mapping_line[0]
-        return start_val
+class PiecewiseMap:
+    """
+    A map of non-negative integers, which adds a constant offset to each number within a segment. Segments are sorted,
+    don't overlap, and together cover all non-negative integers. Segment i covers [starts[i], starts[i + 1]), or
+    [starts[i], infinity) for the last segment, and adds offsets[i].
+    """
+
+    def __init__(self, starts: list[int], offsets: list[int]):
+        assert starts[0] == 0 and len(starts) == len(offsets)
+        # Merge adjacent segments with the same offset.
+        self.starts = [starts[0]]
+        self.offsets = [offsets[0]]
+        for start, offset in zip(starts[1:], offsets[1:]):
+            if offset != self.offsets[-1]:
+                self.starts.append(start)
+                self.offsets.append(offset)
+
+    @classmethod
+    def from_mappings(cls, mappings: list[SingleMappingType]) -> "PiecewiseMap":
+        """Create a map from an almanac's mapping lines. Numbers not covered by any line are mapped to themselves."""
+        starts = [0]
+        offsets = [0]
+        for destination, source, length in sorted(mappings, key=lambda m: m[1]):
+            if length == 0:
+                continue
+            if source == starts[-1]:
+                offsets[-1] = destination - source
+            else:
+                assert source > starts[-1], "Mappings overlap"
+                starts.append(source)
+                offsets.append(destination - source)
+            # Numbers after this mapping line are unmapped, until the next line's source start.
+            starts.append(source + length)
+            offsets.append(0)
+        return cls(starts, offsets)
+
+    def __call__(self, x: int) -> int:
+        return x + self.offsets[bisect.bisect_right(self.starts, x) - 1]
+
+    def then(self, other: "PiecewiseMap") -> "PiecewiseMap":
+        """Return the composition of this map followed by other, i.e. x -> other(self(x))."""
+        starts = []
+        offsets = []
+        for i, (start, offset) in enumerate(zip(self.starts, self.offsets)):
+            end = self.starts[i + 1] if i + 1 < len(self.starts) else None
+            # Split this segment wherever its image crosses a segment boundary of other.
+            image_start = start + offset
+            image_end = None if end is None else end + offset
+            j = bisect.bisect_right(other.starts, image_start) - 1
+            while j < len(other.starts) and (image_end is None or other.starts[j] < image_end):
+                starts.append(max(image_start, other.starts[j]) - offset)
+                offsets.append(offset + other.offsets[j])
+                j += 1
+        return PiecewiseMap(starts, offsets)
+
+    def apply_all(self, xs: "np.ndarray") -> "np.ndarray":
+        """Apply the map to every number in an array at once."""
+        import numpy as np
+
+        segments = np.searchsorted(np.array(self.starts, dtype=np.int64), xs, side="right") - 1
+        return xs + np.array(self.offsets, dtype=np.int64)[segments]
+
+    def min_image(self, start: int, end: int) -> int:
+        """Return the minimum of the map's values over [start, end)."""
+        # Each segment is increasing, so its minimum within the range is at the start of its overlap with the range.
+        first = bisect.bisect_right(self.starts, start) - 1
+        last = bisect.bisect_left(self.starts, end)
+        return min([max(start, self.starts[i]) + self.offsets[i] for i in range(first, last)])
+
+
+def seed_to_location_map(input_data: InputType) -> PiecewiseMap:
+    """Compose all the almanac's maps into a single map from seed to location."""
+    result = PiecewiseMap([0], [0])
+    for _, _, mappings in input_data[1]:
+        result = result.then(PiecewiseMap.from_mappings(mappings))
+    return result
+
+
+def seed_locations(input_data: InputType) -> "np.ndarray":
+    """Return the location of every seed, looked up all at once."""
+    import numpy as np
+
+    return seed_to_location_map(input_data).apply_all(np.array(input_data[0], dtype=np.int64))
 
-    def seed_to_location(seed: int) -> int:
-        current = seed
-        for mapping in input_data[1]:
-            current = apply_map(current, mapping)
-        return current
 
-    return min(map(seed_to_location, input_data[0]))
+def part1(input_data: InputType) -> ResultType:
+    if len(input_data[0]) >= numpy_min_seeds:
+        return int(seed_locations(input_data).min())
+    return min(map(seed_to_location_map(input_data), input_data[0]))
 
 
 def part2(input_data: InputType) -> ResultType:
-    class Range:
-        """
-        A range of numbers [start, end).
-        For convenience, ranges may be of zero length (start == end), covering no numbers.
-        """
-        def __init__(self, start: int, end: int) -> None:
-            self.start: int = start
-            self.end: int = end
-
-        def shift(self, x: int) -> None:
-            self.start += x
-            self.end += x
-
-        def __bool__(self):
-            return self.start != self.end
-
-        def intersection(self, other: Self) -> Self:
-            if other.start < self.start:
-                if other.end > self.start:
-                    return Range(self.start, min(self.end, other.end))
-                else:
-                    return Range(0, 0)
-            elif self.start <= other.start < self.end:
-                return Range(other.start, min(self.end, other.end))
-            else:
-                return Range(0, 0)
-
-        def sub(self, other: Self) -> list[Self]:
-            """
-            'Subtract'.
-            Remove all points in other from this range, and return the resulting ranges (0, 1, or 2).
-            """
-            if not self.intersection(other):
-                return [Range(self.start, self.end)]
-            elif other.start <= self.start <= self.end <= other.end:
-                return []
-            elif other.start <= self.start < other.end < self.end:
-                return [Range(other.end, self.end)]
-            elif self.start < other.start < self.end <= other.end:
-                return [Range(self.start, other.start - 1)]
-            elif self.start < other.start <= other.end < self.end:
-                return [Range(self.start, other.start - 1), Range(other.end, self.end)]
-            else:
-                assert False
-
-    class RangeList:
-        """
-        RangeLists may contain repeated ranges, overlapping ranges, and zero-length ranges.
-        These shouldn't affect the result, and getting rid of them is a lot of extra work.
-        """
-        def __init__(self, rl: list[Range]) -> None:
-            self.ranges: list[Range] = rl
-
-        def intersections(self, other: Range) -> Self:
-            result = RangeList([])
-            for r in self.ranges:
-                intersection = r.intersection(other)
-                if intersection:
-                    result.add(intersection)
-            return result
-
-        def remove(self, other: Range) -> None:
-            new_ranges: list[Range] = []
-            for r in self.ranges:
-                new_ranges += r.sub(other)
-            self.ranges = new_ranges
-
-        def add(self, other: Range) -> None:
-            self.ranges.append(other)
-
-        def min(self) -> int:
-            return min([r.start for r in self.ranges if r])
-
-    seeds = [Range(start, start + length) for start, length in zip(input_data[0][0::2], input_data[0][1::2])]
-
-    def apply_map(rl: RangeList, mapping: MapType) -> RangeList:
-        """
-        Note: this destructively modifies parameter rl.
-        """
-        new_rl = RangeList([])
-        for mapping_line in mapping[2]:
-            mapping_line_range = Range(mapping_line[1], mapping_line[1] + mapping_line[2])
-            intersections = rl.intersections(mapping_line_range)
-            for intersection in intersections.ranges:
-                rl.remove(intersection)
-                intersection.shift(mapping_line[0] - mapping_line[1])
-                new_rl.add(intersection)
-        for remainder in rl.ranges:
-            new_rl.add(remainder)
-        return new_rl
-
-    def seeds_to_location(r: Range) -> RangeList:
-        current = RangeList([r])
-        for mapping in input_data[1]:
-            current = apply_map(current, mapping)
-        return current
-
-    return min([locations.min() for locations in map(seeds_to_location, seeds)])
+    seed_to_location = seed_to_location_map(input_data)
+    return min([seed_to_location.min_image(start, start + length)
+                for start, length in zip(input_data[0][0::2], input_data[0][1::2])])
@@ -1,37 +1,45 @@
 #!/usr/bin/env python3
 
+from collections.abc import Iterable, Iterator
 import math
 from pathlib import Path
 
-# List of races (time, distance)
-InputType = list[tuple[int, int]]
+# Sequence of races (time, distance)
+# load() returns a list, and iter_load() a generator. Both parts accept either.
+InputType = Iterable[tuple[int, int]]
 ResultType = int
 
 
-def load(input_path: Path) -> InputType:
+def iter_load(input_path: Path) -> Iterator[tuple[int, int]]:
     with open(input_path) as f:
-        return list(zip([int(x) for x in f.readline().split()[1:]], [int(x) for x in f.readline().split()[1:]]))
+        yield from zip(map(int, f.readline().split()[1:]), map(int, f.readline().split()[1:]))
 
 
-def part1(input_data: InputType) -> ResultType:
-    def race_wins(time: int, distance: int) -> int:
-        result = 0
-        for t in range(1, time):
-            # No need to check t == 0 or t == time, as these never travel any distance.
-            if t * (time - t) > distance:
-                result += 1
-        return result
+def load(input_path: Path) -> InputType:
+    return list(iter_load(input_path))
 
-    return math.prod([race_wins(t, d) for t, d in input_data])
+
+def race_wins(time: int, distance: int) -> int:
+    """Return the number of whole button hold times that travel further than distance, in a race lasting time."""
+    # Graph of distance travelled (y), against time button held (x), is a downwards-opening parabola, with intercepts at
+    # x = 0 and x = time. Holding for x wins when x * (time - x) > distance, which rearranges to
+    # (2x - time)**2 < time**2 - 4 * distance, the discriminant from the quadratic formula.
+    # So the winning hold times are centred on time / 2, and 2x - time ranges over the integers with the same parity as
+    # time, whose square is less than the discriminant. Working with integer square roots rather than floats keeps this
+    # exact however large the numbers are.
+    discriminant = time ** 2 - 4 * distance
+    if discriminant <= 0:
+        return 0
+    # Largest m with m**2 < discriminant.
+    m = math.isqrt(discriminant - 1)
+    # Integers in [-m, m] with the same parity as time.
+    return m + 1 - ((m - time) & 1)
+
+
+def part1(input_data: InputType) -> ResultType:
+    return math.prod(race_wins(t, d) for t, d in input_data)
 
 
 def part2(input_data: InputType) -> ResultType:
-    time = int("".join([str(x) for x, _ in input_data]))
-    distance = int("".join([str(y) for _, y in input_data]))
-    # Graph of distance travelled (y), against time button held (x), is a downwards-opening parabola, with intercepts at
-    # x = 0 and x = time. We need to find the points where this parabola intersects y = distance, which we can do with
-    # the quadratic formula. We then take the ceiling, which gives the first button-time which beats the record.
-    # From the symmetry of the graph, we know that the other intersection will be at time - min_time_to_win, and we
-    # can calculate the number of time options between the two.
-    min_time_to_win = math.ceil((time - math.sqrt(time ** 2 - 4 * distance)) / 2)
-    return time - 2 * min_time_to_win + 1
+    time_digits, distance_digits = zip(*[(str(x), str(y)) for x, y in input_data])
+    return race_wins(int("".join(time_digits)), int("".join(distance_digits)))
@@ -1,39 +1,55 @@
 #!/usr/bin/env python3
-from collections.abc import Callable
-import functools
+from collections.abc import Callable, Iterable, Iterator
 from pathlib import Path
 
 # A hand is a string of length 5.
 HandType = str
-# List of (hand, bid amount).
-InputType = list[tuple[HandType, int]]
+# Sequence of (hand, bid amount).
+# load() returns a list, and iter_load() a generator. Both parts accept either, though ranking the hands needs them
+# all in memory at once.
+InputType = Iterable[tuple[HandType, int]]
 ResultType = int
 
 
-def load(input_path: Path) -> InputType:
+def iter_load(input_path: Path) -> Iterator[tuple[HandType, int]]:
     with open(input_path) as f:
-        return [(hand, int(bid)) for hand, bid in [line.strip().split() for line in f.readlines()]]
+        for line in f:
+            hand, bid = line.split()
+            yield hand, int(bid)
 
 
-def total_score(input_data: InputType, card_values: str, hand_type_score_func: Callable[[HandType], int]) -> ResultType:
-    def compare_hands(a: HandType, b: HandType) -> int:
-        a_score = hand_type_score_func(a)
-        b_score = hand_type_score_func(b)
-        if a_score < b_score:
-            return -1
-        if b_score < a_score:
-            return 1
+def load(input_path: Path) -> InputType:
+    return list(iter_load(input_path))
+
 
-        for i in range(len(a)):
-            if card_values.index(a[i]) > card_values.index(b[i]):
-                return -1
-            if card_values.index(b[i]) > card_values.index(a[i]):
-                return 1
+# Score of each hand type, by the number of each card in the hand, in descending order.
+hand_type_scores = {
+    (5,): 6,  # Five of a kind
+    (4, 1): 5,  # Four of a kind
+    (3, 2): 4,  # Full house
+    (3, 1, 1): 3,  # Three of a kind
+    (2, 2, 1): 2,  # Two pair
+    (2, 1, 1, 1): 1,  # One pair
+    (1, 1, 1, 1, 1): 0  # High card
+}
+
+
+def total_score(input_data: InputType, card_values: str, hand_type_score_func: Callable[[HandType], int]) -> ResultType:
+    # Each hand is encoded once as a single integer sort key, with the hand type score as the most significant digit,
+    # followed by the value of each card in order, in base len(card_values).
+    # e.g. with 13 card values, each card's value is a digit from 0 (weakest) to c (strongest), and int() can read the
+    # whole hand as a base 13 number.
+    base = len(card_values)
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"[:base]
+    to_digits = str.maketrans(card_values, digits[::-1])
+    type_place = base ** 5
 
-        return 0
+    def sort_key(hand: HandType) -> int:
+        return hand_type_score_func(hand) * type_place + int(hand.translate(to_digits), base)
 
-    return sum([rank * hand[1] for rank, hand in
-                enumerate(sorted(input_data, key=functools.cmp_to_key(lambda a, b: compare_hands(a[0], b[0]))), 1)])
+    # Keys are computed once per hand, and the sort is stable, so identical hands keep their input order.
+    ranked = sorted(input_data, key=lambda hand_bid: sort_key(hand_bid[0]))
+    return sum(rank * bid for rank, (_, bid) in enumerate(ranked, 1))
 
 
 def part1(input_data: InputType) -> ResultType:
@@ -44,15 +60,7 @@ def part1(input_data: InputType) -> ResultType:
         Return an integer representing the quality of a hand based only on its 'type'.
         A full 6 points for 'five of a kind', down to 0 points for 'high card'.
         """
-        return {
-            (5,): 6,  # Five of a kind
-            (4, 1): 5,  # Four of a kind
-            (3, 2): 4,  # Full house
-            (3, 1, 1): 3,  # Three of a kind
-            (2, 2, 1): 2,  # Two pair
-            (2, 1, 1, 1): 1,  # One pair
-            (1, 1, 1, 1, 1): 0  # High card
-        }[tuple([x for x in sorted([h.count(val) for val in card_values], reverse=True) if x != 0])]
+        return hand_type_scores[tuple(sorted(map(h.count, set(h)), reverse=True))]
 
     return total_score(input_data, card_values, hand_type_score)
 
@@ -65,19 +73,12 @@ def part2(input_data: InputType) -> ResultType:
         Return an integer representing the quality of a hand based only on its 'type'.
         A full 6 points for 'five of a kind', down to 0 points for 'high card'.
         """
-        hand_shape = [x for x in sorted([h.count(val) for val in card_values if val != "J"], reverse=True) if x != 0]
-        if len(hand_shape) == 0:
+        jokers = h.count("J")
+        if jokers == 5:
             # Special case for hand JJJJJ
-            hand_shape = [0]
-        hand_shape[0] += h.count("J")
-        return {
-            (5,): 6,  # Five of a kind
-            (4, 1): 5,  # Four of a kind
-            (3, 2): 4,  # Full house
-            (3, 1, 1): 3,  # Three of a kind
-            (2, 2, 1): 2,  # Two pair
-            (2, 1, 1, 1): 1,  # One pair
-            (1, 1, 1, 1, 1): 0  # High card
-        }[tuple(hand_shape)]
+            return hand_type_scores[(5,)]
+        hand_shape = sorted(map(h.count, set(h) - {"J"}), reverse=True)
+        hand_shape[0] += jokers
+        return hand_type_scores[tuple(hand_shape)]
 
     return total_score(input_data, card_values, hand_type_score)
@@ -1,8 +1,14 @@
 #!/usr/bin/env python3
 
+from array import array
+import bisect
+from collections.abc import Callable
+import functools
 import math
 from pathlib import Path
 import re
+import typing
+from typing import Self
 
 InputType = tuple[str, dict[str, tuple[str, str]]]
 ResultType = int
@@ -18,152 +24,161 @@ def load(input_path: Path) -> InputType:
         return instructions, network
 
 
+class Network:
+    """
+    The network compiled to integer node ids, for walking it many steps at a time.
+
+    Nodes are numbered in input order, with left and right holding the node ids reached by each instruction.
+    passes[k][node] is the node reached after 2**k complete passes of the instructions, starting from node at the start
+    of the instructions, so walking any number of passes takes one lookup per bit of that number.
+    """
+
+    def __init__(self, input_data: InputType, is_end: Callable[[str], bool]):
+        self.instructions, network = input_data
+        self.names = list(network.keys())
+        ids = {name: i for i, name in enumerate(self.names)}
+        self.ids = ids
+        self.left = array("I", (ids[left] for left, _ in network.values()))
+        self.right = array("I", (ids[right] for _, right in network.values()))
+        self.pass_length = len(self.instructions)
+
+        # Walk every node through one pass of the instructions at once, noting the offsets within the pass at which
+        # each reaches an end node.
+        end_flags = bytes(is_end(name) for name in self.names)
+        ends: list[list[int]] = [[] for _ in self.names]
+        current = array("I", range(len(self.names)))
+        for offset, instruction in enumerate(self.instructions):
+            on_end = bytes(map(end_flags.__getitem__, current))
+            start = on_end.find(1)
+            while start != -1:
+                ends[start].append(offset)
+                start = on_end.find(1, start + 1)
+            current = array("I", map((self.left if instruction == "L" else self.right).__getitem__, current))
+        # ends_index[node]:ends_index[node + 1] is the range of end_offsets for node, in ascending order.
+        self.ends_index = array("I", [0])
+        self.end_offsets = array("I")
+        for node_ends in ends:
+            self.end_offsets.extend(node_ends)
+            self.ends_index.append(len(self.end_offsets))
+        self.passes = [current]
+
+    def step(self, node: int, offset: int) -> int:
+        """Return the node reached from node by the instruction at offset."""
+        return (self.left if self.instructions[offset] == "L" else self.right)[node]
+
+    def pass_ends(self, node: int) -> array:
+        """Return the offsets within a pass starting at node, at which the walk is on an end node."""
+        return self.end_offsets[self.ends_index[node]:self.ends_index[node + 1]]
+
+    def walk_passes(self, node: int, passes: int) -> int:
+        """Return the node reached after the given number of complete passes of the instructions from node."""
+        k = 0
+        while passes:
+            if k == len(self.passes):
+                self.passes.append(array("I", map(self.passes[-1].__getitem__, self.passes[-1])))
+            if passes & 1:
+                node = self.passes[k][node]
+            passes >>= 1
+            k += 1
+        return node
+
+    def walk(self, node: int, steps: int) -> int:
+        """Return the node reached after the given number of steps from node, starting at the start of the instructions."""
+        passes, remainder = divmod(steps, self.pass_length)
+        node = self.walk_passes(node, passes)
+        for offset in range(remainder):
+            node = self.step(node, offset)
+        return node
+
+
 def part1(input_data: InputType) -> ResultType:
-    current = "AAA"
-    steps = 0
-    while current != "ZZZ":
-        current = input_data[1][current][0 if input_data[0][steps % len(input_data[0])] == "L" else 1]
-        steps += 1
-    return steps
+    network = Network(input_data, lambda name: name == "ZZZ")
+    node = network.ids["AAA"]
+    # Walk whole passes until one passes ZZZ. There are only so many nodes to start a pass at.
+    for passes in range(len(network.names) + 1):
+        if ends := network.pass_ends(node):
+            return passes * network.pass_length + ends[0]
+        node = network.passes[0][node]
+    raise ValueError("ZZZ is unreachable from AAA.")
+
+
+class Ghost(typing.NamedTuple):
+    """
+    The steps at which a ghost is on an end node.
+    After loop_start steps, the ghost's path repeats every loop_length steps.
+    """
+    loop_start: int
+    loop_length: int
+    # Steps before loop_start at which the ghost is on an end node, in ascending order.
+    initial_ends: list[int]
+    # Steps in the first loop, from loop_start to loop_start + loop_length, at which the ghost is on an end node.
+    loop_ends: list[int]
+
+    @classmethod
+    def from_start(cls, network: Network, start_node: int) -> Self:
+        # The ghost's state is its node and offset into the instructions, so its path repeats from the first node it
+        # starts a pass of the instructions at twice.
+        # Dictionary from node to the number of passes it first took to start a pass at that node.
+        memo: dict[int, int] = {}
+        # Steps at which the ghost is on an end node, up to the end of the first loop.
+        ends: list[int] = []
+        node = start_node
+        passes = 0
+        while node not in memo:
+            memo[node] = passes
+            ends.extend(passes * network.pass_length + offset for offset in network.pass_ends(node))
+            node = network.passes[0][node]
+            passes += 1
+
+        loop_start = memo[node] * network.pass_length
+        split = bisect.bisect_left(ends, loop_start)
+        return cls(loop_start, (passes - memo[node]) * network.pass_length, ends[:split], ends[split:])
+
+    def is_on_end(self, steps: int) -> bool:
+        if steps < self.loop_start:
+            i = bisect.bisect_left(self.initial_ends, steps)
+            return i < len(self.initial_ends) and self.initial_ends[i] == steps
+        steps = self.loop_start + (steps - self.loop_start) % self.loop_length
+        i = bisect.bisect_left(self.loop_ends, steps)
+        return i < len(self.loop_ends) and self.loop_ends[i] == steps
+
+
+def combine_congruences(a: tuple[int, set[int]], b: tuple[int, set[int]]) -> tuple[int, set[int]]:
+    """
+    Given sets of allowed residues for two moduli, as (modulus, residues), return the (modulus, residues) of the numbers
+    that satisfy both, using the Chinese remainder theorem generalised to moduli that aren't coprime.
+    """
+    m, a_residues = a
+    n, b_residues = b
+    g = math.gcd(m, n)
+    lcm = m // g * n
+    # Inverse of m / g, modulo n / g, for lifting a residue modulo m to one modulo lcm(m, n).
+    m_inverse = pow(m // g, -1, n // g)
+    result = set()
+    for x in a_residues:
+        for y in b_residues:
+            difference = y - x
+            if difference % g == 0:
+                result.add((x + m * (difference // g * m_inverse % (n // g))) % lcm)
+    return lcm, result
 
 
 def part2(input_data: InputType) -> ResultType:
-    # This solution is correct, even if not all ghosts are of a 'simple' type (looping with a single end node), but
-    # relies on most ghosts being simple in order to return a solution in a reasonable time.
-
-    class Ghost:
-        def __init__(self, start_node: str):
-            def find_loop() -> None:
-                """
-                Find the point at which this ghost starts repeating its path, and the length of that loop.
-                """
-                # Dictionary from (instructions_offset, node) to the number of steps it first took to reach that state.
-                memo: dict[tuple[int, str], int] = {(0, start_node): 0}
-                steps = 0
-                instructions_offset = 0
-                node = start_node
-                while True:
-                    node = input_data[1][node][0 if input_data[0][instructions_offset] == "L" else 1]
-                    steps += 1
-                    instructions_offset = (instructions_offset + 1) % len(input_data[0])
-                    if (instructions_offset, node) in memo:
-                        break
-                    else:
-                        memo[(instructions_offset, node)] = steps
-
-                # Number of steps after which the ghost starts looping (traversing the same cycle of nodes repeatedly).
-                self.loop_start: int = memo[(instructions_offset, node)]
-                # Length of the loop.
-                self.loop_length: int = steps - self.loop_start
-            find_loop()
-
-            def run_length_encode_path(start: int, length: int) -> list[tuple[int, bool]]:
-                """
-                Create a run-length encoded version of this ghost's path, noting only whether at each point the ghost
-                is on end or non-end node.
-                Run-length encoded paths are a list of (length, is_end_node).
-                e.g. [(4, False), (2, True), (10, False)] is a path of 4 non-end nodes, 2 end, nodes, then 10 non-end
-                nodes.
-                """
-                result: list[tuple[int, bool]] = []
-                node = start_node
-                instructions_offset = 0
-                for i in range(start):
-                    node = input_data[1][node][0 if input_data[0][instructions_offset] == "L" else 1]
-                    instructions_offset = (instructions_offset + 1) % len(input_data[0])
-                for i in range(length):
-                    on_end = node.endswith("Z")
-                    if len(result) == 0 or result[-1][1] != on_end:
-                        result.append((1, on_end))
-                    else:
-                        result[-1] = (result[-1][0] + 1, on_end)
-                    # Move to next node.
-                    node = input_data[1][node][0 if input_data[0][instructions_offset] == "L" else 1]
-                    instructions_offset = (instructions_offset + 1) % len(input_data[0])
-                return result
-
-            self.initial_path = run_length_encode_path(0, self.loop_start)
-            self.loop_path = run_length_encode_path(self.loop_start, self.loop_length)
-
-            if len(self.loop_path) >= 2 and self.loop_path[0][1] == self.loop_path[-1][1]:
-                # Can simplify loop path by copying the first segment into the initial path, and moving that first loop
-                # segment to the end of the loop, combining it with the last segment.
-                if self.loop_path[0][1] == self.initial_path[-1][1]:
-                    self.initial_path[-1] = (self.initial_path[-1][0] + self.loop_path[0][0], self.initial_path[-1][1])
-                else:
-                    self.initial_path.append(self.loop_path[0])
-                self.loop_path[-1] = (self.loop_path[-1][0] + self.loop_path[0][0], self.loop_path[-1][1])
-                self.loop_path.pop(0)
-
-            # A ghost is simple if its loop path is 1 end node, and a single sequence of non-end nodes.
-            # i.e. self.loop_path == [(1, True), (_, False)]
-            # Simple ghosts are easy to combine with other ghosts at the point in time when they're both
-            # on their end nodes.
-            # This seems to cover all ghosts in my input file.
-            self.is_simple = len(self.loop_path) == 2 and self.loop_path[0][0] == 1 and \
-                self.loop_path[0][1] and not self.loop_path[1][1]
-
-            # True if this ghost is in initial_path, False if the ghost is in loop_path.
-            self.is_in_initial = True
-            # Index within the path of the current segment.
-            self.current_segment_index = 0
-            # Offset within the current segment.
-            self.current_segment_offset = 0
-
-        def current_segment(self) -> tuple[int, bool]:
-            if self.is_in_initial:
-                return self.initial_path[self.current_segment_index]
-            else:
-                return self.loop_path[self.current_segment_index]
-
-        def increment_segment(self) -> None:
-            self.current_segment_index += 1
-            if self.current_segment_index >= len(self.initial_path if self.is_in_initial else self.loop_path):
-                self.is_in_initial = False
-                self.current_segment_index = 0
-
-        def segment_remaining(self) -> int:
-            return self.current_segment()[0] - self.current_segment_offset
-
-        def run_steps(self, distance: int) -> None:
-            """
-            Run this ghost for the specified distance (number of steps), updating is_in_initial, current_segment, and
-            current_segment_offset.
-            """
-            while distance > 0:
-                if distance >= self.segment_remaining():
-                    distance -= self.segment_remaining()
-                    self.increment_segment()
-                    self.current_segment_offset = 0
-                else:
-                    self.current_segment_offset += distance
-                    distance = 0
-
-        def is_on_end(self) -> bool:
-            return self.current_segment()[1]
-
-    def merge_ghosts(a: Ghost, b: Ghost) -> None:
-        """
-        Merge ghost b into ghost a.
-        """
-        for ghost in [a, b]:
-            assert not ghost.is_in_initial and ghost.is_simple and ghost.is_on_end()
-            assert ghost.current_segment_index == 0 and ghost.current_segment_offset == 0
-        a.loop_length = math.lcm(a.loop_length, b.loop_length)
-        a.loop_path = [(1, True), (a.loop_length - 1, False)]
-
-    ghosts = [Ghost(node) for node in input_data[1].keys() if node.endswith("A")]
-    steps = 0
-    while not all([ghost.is_on_end() for ghost in ghosts]):
-        while len(to_merge := [i for i, ghost in enumerate(ghosts)
-                               if ghost.is_simple and not ghost.is_in_initial and ghost.is_on_end()][:2]) >= 2:
-            # 2 simple ghosts are both on their end node, and can be merged into a single ghost.
-            merge_ghosts(ghosts[to_merge[0]], ghosts[to_merge[1]])
-            del ghosts[to_merge[1]]
-
-        run_distance = max([ghost.segment_remaining() for ghost in ghosts if not ghost.is_on_end()])
-        for ghost in ghosts:
-            ghost.run_steps(run_distance)
-        steps += run_distance
-
-    return steps
+    network = Network(input_data, lambda name: name.endswith("Z"))
+    ghosts = [Ghost.from_start(network, node) for name, node in network.ids.items() if name.endswith("A")]
+
+    # Before every ghost has reached its loop, the ghosts can only all be on end nodes when the one that takes longest
+    # to reach its loop is at one of its initial end nodes.
+    slowest = max(ghosts, key=lambda ghost: ghost.loop_start)
+    for steps in slowest.initial_ends:
+        if all(ghost.is_on_end(steps) for ghost in ghosts):
+            return steps
+
+    # From then on, every ghost is on an end node at steps congruent to one of its loop ends, modulo its loop length.
+    # Combining those congruences for all ghosts gives the steps at which they're all on end nodes.
+    modulus, residues = functools.reduce(
+        combine_congruences,
+        ((ghost.loop_length, {end % ghost.loop_length for end in ghost.loop_ends}) for ghost in ghosts))
+    if not residues:
+        raise ValueError("The ghosts are never all on end nodes at once.")
+    return min(slowest.loop_start + (residue - slowest.loop_start) % modulus for residue in residues)
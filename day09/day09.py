@@ -1,34 +1,86 @@
 #!/usr/bin/env python3
 
-import itertools
+from collections.abc import Iterable, Iterator
+import functools
+import math
+import operator
 from pathlib import Path
+import typing
 
-InputType = list[list[int]]
+# NumPy is only imported for large batches of equal length sequences, to keep startup fast.
+if typing.TYPE_CHECKING:
+    import numpy as np
+
+# load() returns a list of sequences, and iter_load() a generator of them. Both parts accept either.
+InputType = Iterable[list[int]]
 ResultType = int
 
+# Number of sequences at which extrapolating all of them at once with NumPy is faster than one at a time, including the
+# time to import NumPy.
+numpy_min_sequences = 100_000
 
-def load(input_path: Path) -> InputType:
+
+def iter_load(input_path: Path) -> Iterator[list[int]]:
     with open(input_path) as f:
-        return [[int(x) for x in line.strip().split(" ")]for line in f.readlines()]
+        for line in f:
+            yield [int(x) for x in line.strip().split(" ")]
 
 
-def part1(input_data: InputType) -> ResultType:
-    def next_num(l: list[int]) -> int:
-        sequence_deltas: list[list[int]] = [l]
-        while not all([x == 0 for x in sequence_deltas[-1]]):
-            sequence_deltas.append([b - a for a, b in itertools.pairwise(sequence_deltas[-1])])
-        return sum([sd[-1] for sd in sequence_deltas])
+def load(input_path: Path) -> InputType:
+    return list(iter_load(input_path))
+
+
+@functools.cache
+def extrapolation_coefficients(length: int, steps: int) -> tuple[int, ...]:
+    """
+    Return the coefficients c such that sum(c[i] * x[i]) is the value the given number of steps after the end of any
+    sequence x of this length. Zero steps after the end is the last value of the sequence.
+    """
+    if steps == 0:
+        return (0,) * (length - 1) + (1,)
+    # Repeatedly taking differences until they're all 0 and extrapolating back up the triangle is the same as
+    # extrapolating the polynomial of degree < length through x[0], ..., x[length - 1] at 0, ..., length - 1.
+    # The Lagrange basis polynomials at t = length - 1 + steps reduce to a product of two binomial coefficients.
+    t = length - 1 + steps
+    return tuple((-1) ** (length - 1 - i) * math.comb(t, i) * math.comb(t - i - 1, length - 1 - i)
+                 for i in range(length))
+
 
-    return sum(map(next_num, input_data))
+def extrapolate(sequence: list[int], steps: int = 1) -> int:
+    """
+    Return the value the given number of steps after the end of the sequence, or before its start if steps is negative.
+    """
+    coefficients = extrapolation_coefficients(len(sequence), abs(steps))
+    return sum(map(operator.mul, coefficients, sequence if steps >= 0 else reversed(sequence)))
+
+
+def extrapolate_all(sequences: list[list[int]], steps: int = 1) -> "np.ndarray":
+    """As extrapolate(), for a list of sequences of equal length, all at once."""
+    import numpy as np
+
+    coefficients = extrapolation_coefficients(len(sequences[0]), abs(steps))
+    if steps < 0:
+        coefficients = coefficients[::-1]
+    try:
+        matrix = np.array(sequences, dtype=np.int64)
+    except OverflowError:
+        matrix = np.array(sequences, dtype=object)
+    # Use machine integers unless the result could overflow them.
+    bound = sum(map(abs, coefficients)) * max(abs(int(matrix.min())), abs(int(matrix.max())))
+    dtype = np.int64 if bound < 2 ** 63 else object
+    return matrix.astype(dtype) @ np.array(coefficients, dtype=dtype)
+
+
+def total_extrapolated(input_data: InputType, steps: int) -> ResultType:
+    if isinstance(input_data, list) and len(input_data) >= numpy_min_sequences and \
+            len({len(sequence) for sequence in input_data}) == 1:
+        return int(extrapolate_all(input_data, steps).sum(dtype=object))
+    return sum(extrapolate(sequence, steps) for sequence in input_data)
+
+
+def part1(input_data: InputType) -> ResultType:
+    return total_extrapolated(input_data, 1)
 
 
 def part2(input_data: InputType) -> ResultType:
-    def prev_num(l: list[int]) -> int:
-        sequence_deltas: list[list[int]] = [l]
-        while not all([x == 0 for x in sequence_deltas[-1]]):
-            sequence_deltas.append([b - a for a, b in itertools.pairwise(sequence_deltas[-1])])
-        # Result for this one takes the left side of sequence_deltas, and alternates between adding and subtracting
-        # values.
-        return sum([x if i % 2 == 0 else -x for i, x in enumerate([sd[0] for sd in sequence_deltas])])
-
-    return sum(map(prev_num, input_data))
+    return total_extrapolated(input_data, -1)
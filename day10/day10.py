@@ -1,29 +1,30 @@
 #!/usr/bin/env python3
 
+from array import array
+import itertools
 from pathlib import Path
 
-InputType = list[str]
+from grid import Grid
+
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [line.strip() for line in f.readlines()]
+    return Grid.from_file(input_path)
 
 
 def find_start(input_data: InputType) -> tuple[int, int]:
     """Returns row, col of starting point."""
-    for row, line in enumerate(input_data):
-        if "S" in line:
-            return row, line.index("S")
+    return input_data.find("S")
 
 
 def start_pipe(input_data: InputType, start_row: int, start_col: int) -> str:
     """Returns the character representing the pipe on the start location."""
-    left = False if start_col == 0 else (input_data[start_row][start_col - 1] in "-LF")
-    right = False if start_col == len(input_data[0]) - 1 else (input_data[start_row][start_col + 1] in "-J7")
-    up = False if start_row == 0 else (input_data[start_row - 1][start_col] in "|7F")
-    down = False if start_row == len(input_data) - 1 else (input_data[start_row + 1][start_col] in "|LJ")
+    left = False if start_col == 0 else (input_data[start_row, start_col - 1] in "-LF")
+    right = False if start_col == input_data.width - 1 else (input_data[start_row, start_col + 1] in "-J7")
+    up = False if start_row == 0 else (input_data[start_row - 1, start_col] in "|7F")
+    down = False if start_row == input_data.height - 1 else (input_data[start_row + 1, start_col] in "|LJ")
     return {
         (False, False, True, True): "|",
         (True, True, False, False): "-",
@@ -34,93 +35,72 @@ def start_pipe(input_data: InputType, start_row: int, start_col: int) -> str:
     }[(left, right, up, down)]
 
 
-def adjacent_pipe_segment(input_data: InputType, row: int, col: int) -> tuple[tuple[int, int], tuple[int, int]]:
-    """Returns the (row, col) of the two pipe segments adjacent to this one."""
-    return {
-        "|": ((row - 1, col), (row + 1, col)),
-        "-": ((row, col - 1), (row, col + 1)),
-        "L": ((row - 1, col), (row, col + 1)),
-        "J": ((row - 1, col), (row, col - 1)),
-        "7": ((row + 1, col), (row, col - 1)),
-        "F": ((row + 1, col), (row, col + 1)),
-    }[input_data[row][col]]
+def pipe_offsets(stride: int) -> list[tuple[int, int] | None]:
+    """
+    Returns a table from each byte to the offsets within a grid's buffer of the two pipe segments adjacent to a pipe
+    segment of that character, or None for bytes that aren't pipes.
+    """
+    table: list[tuple[int, int] | None] = [None] * 256
+    for pipe, offsets in {
+        "|": (-stride, stride),
+        "-": (-1, 1),
+        "L": (-stride, 1),
+        "J": (-stride, -1),
+        "7": (stride, -1),
+        "F": (stride, 1),
+    }.items():
+        table[ord(pipe)] = offsets
+    return table
+
+
+def trace_loop(input_data: InputType) -> array:
+    """
+    Returns the index in the grid's buffer of each pipe segment in the loop in order, starting from the start location.
+    """
+    start_row, start_col = find_start(input_data)
+    start = input_data.index(start_row, start_col)
+    offsets = pipe_offsets(input_data.stride)
+    buffer = input_data.buffer
+    indices = array("I", [start])
+
+    prev = start
+    pos = start + offsets[ord(start_pipe(input_data, start_row, start_col))][0]
+    while pos != start:
+        indices.append(pos)
+        a, b = offsets[buffer[pos]]
+        prev, pos = pos, pos + a if pos + a != prev else pos + b
+    return indices
 
 
-def part1(input_data: InputType) -> ResultType:
-    start = find_start(input_data)
-    input_data[start[0]] = \
-        input_data[start[0]][:start[1]] + start_pipe(input_data, *start) + input_data[start[0]][start[1] + 1:]
+def loop_members(input_data: InputType, indices: array) -> bytearray:
+    """
+    Returns a bitmap of the loop traced by trace_loop(), for interior counting methods which need it.
+    Byte i is 1 if the cell at index i of the grid's buffer is part of the loop, and 0 otherwise.
+    """
+    members = bytearray(len(input_data.buffer))
+    for i in indices:
+        members[i] = 1
+    return members
 
-    steps = 1
-    prev_pos = start
-    pos = adjacent_pipe_segment(input_data, *start)[0]
-    while pos != start:
-        adj = adjacent_pipe_segment(input_data, *pos)
-        if adj[0] == prev_pos:
-            prev_pos = pos
-            pos = adj[1]
-        else:
-            prev_pos = pos
-            pos = adj[0]
-        steps += 1
+
+def part1(input_data: InputType) -> ResultType:
+    steps = len(trace_loop(input_data))
     assert steps % 2 == 0
     return steps // 2
 
 
 def part2(input_data: InputType) -> ResultType:
-    start = find_start(input_data)
-    input_data[start[0]] = \
-        input_data[start[0]][:start[1]] + start_pipe(input_data, *start) + input_data[start[0]][start[1] + 1:]
-
-    # Remove all non-loop pipe segments, replacing them with open ground.
-    prev_pos = start
-    pos = adjacent_pipe_segment(input_data, *start)[0]
-    loop = [pos]
-    while pos != start:
-        adj = adjacent_pipe_segment(input_data, *pos)
-        if adj[0] == prev_pos:
-            prev_pos = pos
-            pos = adj[1]
-        else:
-            prev_pos = pos
-            pos = adj[0]
-        loop.append(pos)
-    input_data = ["".join([char if (row, col) in loop else "." for col, char in enumerate(line)]) for row, line in enumerate(input_data)]
-
-    # Expand the original m x n map into a 3m x 3n map with ascii-art representations of each tile.
-    #
-    #      ...         .#.
-    # 7 -> ##.    | -> .#.   etc.
-    #      .#.         .#.
-    #
-    # True represents a pipe boundary, and False is open ground.
-    expanded_map = [[{
-        ".": [[False, False, False], [False, False, False], [False, False, False]],
-        "|": [[False, True, False], [False, True, False], [False, True, False]],
-        "-": [[False, False, False], [True, True, True], [False, False, False]],
-        "L": [[False, True, False], [False, True, True], [False, False, False]],
-        "J": [[False, True, False], [True, True, False], [False, False, False]],
-        "7": [[False, False, False], [True, True, False], [False, True, False]],
-        "F": [[False, False, False], [False, True, True], [False, True, False]],
-                     }[input_data[row // 3][col // 3]][row % 3][col % 3]
-        for col in range(3 * len(input_data[0]))] for row in range(3 * len(input_data))]
-
-    # Flood fill from upper-left corner (which can't be inside the loop).
-    # Entire outer perimeter of the expanded map must initially be False, as the loop can't extend outside the outer
-    # bounds of the original map.
-    next_cells: set[tuple[int, int]] = {(0, 0)}
-    while len(next_cells) > 0:
-        current = next_cells.pop()
-        expanded_map[current[0]][current[1]] = True
-        for row, col in [(current[0] - 1, current[1]),
-                         (current[0] + 1, current[1]),
-                         (current[0], current[1] - 1),
-                         (current[0], current[1] + 1)]:
-            if 0 <= row < len(expanded_map) and 0 <= col < len(expanded_map[0]) and not expanded_map[row][col]:
-                next_cells.add((row, col))
-
-    # For each open cell on the original map, check if the centre cell for that tile in the expanded map
-    # has been filled in by the flood fill. Unfilled cells are inside the loop.
-    return sum([sum([1 if not expanded_map[row * 3 + 1][col * 3 + 1] else 0
-                     for col, cell in enumerate(line) if cell == "."])
-                for row, line in enumerate(input_data)])
+    # Treating the centre of each tile as a point on an integer lattice, the loop is a polygon whose vertices are all on
+    # the lattice, and which passes through a lattice point for every tile in the loop.
+    # Its area is given by the shoelace formula, which for a loop of unit steps is the sum of row * change in column
+    # over the loop's horizontal steps.
+    # Pick's theorem then relates that area to the number of lattice points inside and on the boundary of the polygon:
+    # area = inside + boundary / 2 - 1
+    indices = trace_loop(input_data)
+    offset = input_data.offset
+    stride = input_data.stride
+    area = 0
+    for i, j in itertools.pairwise(itertools.chain(indices, indices[:1])):
+        if j - i in (-1, 1):
+            area += (i - offset) // stride * (j - i)
+    return abs(area) - len(indices) // 2 + 1
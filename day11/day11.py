@@ -3,39 +3,27 @@
 import itertools
 from pathlib import Path
 
-# True for each galaxy, false otherwise.
-InputType = list[list[bool]]
+from grid import Grid
+
+# "#" for each galaxy, "." otherwise.
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [[char == "#" for char in line.strip()] for line in f.readlines()]
+    return Grid.from_file(input_path)
 
 
 def part1(input_data: InputType) -> ResultType:
-    # Expand space.
-    empty_rows = reversed([row for row, line in enumerate(input_data) if not any(line)])
-    empty_cols = reversed([col for col in range(len(input_data[0])) if not any([line[col] for line in input_data])])
-    # Index lists are reversed, so early inserts don't alter the position of later inserts.
-    for empty_row in empty_rows:
-        input_data.insert(empty_row, [False for _ in range(len(input_data[0]))])
-    for empty_col in empty_cols:
-        for row in input_data:
-            row.insert(empty_col, False)
-
-    # Find galaxies, as a list of (row, col).
-    galaxies: list[tuple[int, int]] = \
-        [(row, col) for row, line in enumerate(input_data) for col, cell in enumerate(line) if cell]
-
-    return sum([abs(a[0] - b[0]) + abs(a[1] - b[1]) for a, b in itertools.combinations(galaxies, 2)])
+    # Each empty row and column is doubled.
+    return part2(input_data, 2)
 
 
 def part2(input_data: InputType, expansion_factor: int = 1_000_000) -> ResultType:
-    empty_rows = [row for row, line in enumerate(input_data) if not any(line)]
-    empty_cols = [col for col in range(len(input_data[0])) if not any([line[col] for line in input_data])]
-    galaxies: list[tuple[int, int]] = \
-        [(row, col) for row, line in enumerate(input_data) for col, cell in enumerate(line) if cell]
+    # Find galaxies, as a list of (row, col).
+    galaxies: list[tuple[int, int]] = list(input_data.find_all("#"))
+    empty_rows = sorted(set(range(input_data.height)) - {row for row, _ in galaxies})
+    empty_cols = sorted(set(range(input_data.width)) - {col for _, col in galaxies})
 
     total_distance = 0
     for a, b in itertools.combinations(galaxies, 2):
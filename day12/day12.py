@@ -1,20 +1,36 @@
 #!/usr/bin/env python3
 
+from collections.abc import Iterable, Iterator
+import itertools
 import math
-import multiprocessing
+import os
 from pathlib import Path
 import re
+import typing
 
-InputType = list[tuple[str, list[int]]]
+# Only imported when running in parallel, to keep startup fast.
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+# load() returns a list of rows, and iter_load() a generator of them. Both parts accept either.
+InputType = Iterable[tuple[str, list[int]]]
 ResultType = int
 
+# Number of rows sent to the executor at a time, to limit memory use on very long inputs.
+batch_size = 10_000
 
-def load(input_path: Path) -> InputType:
+
+def iter_load(input_path: Path) -> Iterator[tuple[str, list[int]]]:
     def parse_line(s: str) -> tuple[str, list[int]]:
         a, b = s.split(" ")
         return a, [int(x) for x in b.split(",")]
     with open(input_path) as f:
-        return [parse_line(line.strip()) for line in f.readlines()]
+        for line in f:
+            yield parse_line(line.strip())
+
+
+def load(input_path: Path) -> InputType:
+    return list(iter_load(input_path))
 
 
 all_dots_regex = re.compile(r"^(?:\.+|$)")
@@ -125,18 +141,26 @@ def possible_layouts(s: str, groups: list[int]) -> int:
 
 
 def possible_layouts_shim(*args, **kwargs):
-    """Required, as possible_layouts() can't be used with pool.starmap (due to decorator with local memo variable).
+    """Required, as possible_layouts() can't be used with executor.map (due to decorator with local memo variable).
     Note that different processes may see different memo dictionaries. This shouldn't affect correctness, as a
     missing entry in that dictionary would just be recalculated, and possible_layouts() is a pure function which
     will return the same result in each process."""
     return possible_layouts(*args, **kwargs)
 
 
-def part1(input_data: InputType) -> ResultType:
-    with multiprocessing.Pool() as pool:
-        return sum(pool.starmap(possible_layouts_shim, input_data))
+def part1(input_data: InputType, executor: "Executor | None" = None) -> ResultType:
+    if executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor() as executor:
+            return part1(input_data, executor)
+
+    total = 0
+    input_iter = iter(input_data)
+    while batch := list(itertools.islice(input_iter, batch_size)):
+        total += sum(executor.map(possible_layouts_shim, [s for s, _ in batch], [g for _, g in batch],
+                                  chunksize=max(1, len(batch) // (4 * (os.cpu_count() or 1)))))
+    return total
 
 
-def part2(input_data: InputType) -> ResultType:
-    input_data = [("?".join([s] * 5), g * 5) for s, g in input_data]
-    return part1(input_data)
+def part2(input_data: InputType, executor: "Executor | None" = None) -> ResultType:
+    return part1((("?".join([s] * 5), g * 5) for s, g in input_data), executor)
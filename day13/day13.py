@@ -2,21 +2,26 @@
 
 from collections.abc import Iterator
 from pathlib import Path
+import re
 
-SingleImageType = list[list[bool]]
-InputType = list[SingleImageType]
+from grid import Grid, map_file
+
+InputType = list[Grid]
 ResultType = int
+# Image rows (or columns) as strings.
+SingleImageType = list[str]
 
 
 def load(input_path: Path) -> InputType:
-    result = [[]]
-    with open(input_path) as f:
-        for line in f.readlines():
-            line = line.strip()
-            if not line:
-                result.append([])
-            else:
-                result[len(result)-1].append([c == "#" for c in line])
+    # Images are separated by blank lines, and all share the buffer of the whole file.
+    buffer = map_file(input_path)
+    result = []
+    start = 0
+    for separator in re.finditer(rb"\r?\n(?:\r?\n)+", buffer):
+        result.append(Grid.from_buffer(buffer, start, separator.start()))
+        start = separator.end()
+    if buffer[start:].strip():
+        result.append(Grid.from_buffer(buffer, start))
     return result
 
 
@@ -34,8 +39,8 @@ def part1(input_data: InputType) -> ResultType:
             if is_v_reflection(image, i):
                 yield i
 
-    # Use zip(*image) to transpose image, swapping rows for columns.
-    return sum([sum(v_reflections(image)) + 100 * sum(v_reflections([list(row) for row in zip(*image)]))
+    # Horizontal reflections are vertical reflections of the image's columns.
+    return sum([sum(v_reflections(list(image))) + 100 * sum(v_reflections(image.columns()))
                 for image in input_data])
 
 
@@ -52,6 +57,6 @@ def part2(input_data: InputType) -> ResultType:
                 return i
         return 0
 
-    # Use zip(*image) to transpose image, swapping rows for columns.
-    return sum([v_smudged_reflection(image) or 100 * v_smudged_reflection([list(row) for row in zip(*image)])
+    # Horizontal reflections are vertical reflections of the image's columns.
+    return sum([v_smudged_reflection(list(image)) or 100 * v_smudged_reflection(image.columns())
                 for image in input_data])
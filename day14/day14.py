@@ -2,18 +2,19 @@
 
 from pathlib import Path
 
-InputType = list[str]
+from grid import Grid
+
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [line.strip() for line in f.readlines()]
+    return Grid.from_file(input_path)
 
 
 def part1(input_data: InputType) -> ResultType:
     # Transpose input_data, as working row-by-row will be easier.
-    input_data = ["".join(col) for col in zip(*input_data)]
+    input_data = input_data.columns()
     # Load produced by a single rounded rock at the north-most edge.
     max_load = len(input_data[0])
     total_load = 0
@@ -30,6 +31,9 @@ def part1(input_data: InputType) -> ResultType:
 
 
 def part2(input_data: InputType) -> ResultType:
+    # The platform is rolled as a list of row strings.
+    input_data: list[str] = list(input_data)
+
     def roll_line_right(line: str) -> str:
         areas_between_squares = line.split("#")
         return "#".join([("." * (len(area) - rounded_boulders)) + ("O" * rounded_boulders)
@@ -1,16 +1,29 @@
 #!/usr/bin/env python3
 
+from collections.abc import Iterable, Iterator
 from pathlib import Path
 import re
 import sys
 
-InputType = list[str]
+# load() returns a list of steps, and iter_load() a generator of them. Both parts accept either.
+InputType = Iterable[str]
 ResultType = int
 
 
-def load(input_path: Path) -> InputType:
+def iter_load(input_path: Path, chunk_size: int = 64 * 1024) -> Iterator[str]:
+    """Generator of steps, which reads the (single line) input a chunk at a time."""
+    # Partial step at the end of the last chunk.
+    step = ""
     with open(input_path) as f:
-        return "".join([line.strip() for line in f.readlines()]).split(",")
+        while chunk := f.read(chunk_size):
+            steps = (step + chunk.replace("\n", "").replace("\r", "")).split(",")
+            step = steps.pop()
+            yield from steps
+    yield step
+
+
+def load(input_path: Path) -> InputType:
+    return list(iter_load(input_path))
 
 
 def hash_algorithm(s: str) -> int:
@@ -28,9 +41,9 @@ def part1(input_data: InputType) -> ResultType:
 def part2(input_data: InputType) -> ResultType:
     step_regex = re.compile(r"([a-z]+)(-|=\d+)")
     # Parse input data to a list of (lens_label, target_box, True=remove_lens False=add/replace_lens, focal_length).
-    input_data = [(match.group(1), hash_algorithm(match.group(1)), match.group(2)[0] == "-",
+    input_data = ((match.group(1), hash_algorithm(match.group(1)), match.group(2)[0] == "-",
                    int(match.group(2)[1:]) if match.group(2)[0] == "=" else None)
-                  for match in map(step_regex.fullmatch, input_data)]
+                  for match in map(step_regex.fullmatch, input_data))
     # Dicts are insertion ordered as of Python 3.7, which we'll rely on to keep lenses ordered in our boxes.
     # First-inserted element will be the front-most lens in each box.
     assert sys.version_info >= (3, 7)
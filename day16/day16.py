@@ -1,17 +1,23 @@
 #!/usr/bin/env python3
 
 from enum import Enum
-import multiprocessing
+import itertools
+import os
 from pathlib import Path
 import typing
 
-InputType = list[str]
+from grid import Grid
+
+# Only imported when running in parallel, to keep startup fast.
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [line.strip() for line in f.readlines()]
+    return Grid.from_file(input_path)
 
 
 class BeamDirection(Enum):
@@ -38,7 +44,7 @@ class Beam(typing.NamedTuple):
 def energised_tiles(input_data: InputType, starting_beam: Beam) -> int:
     beams = [starting_beam]
     beam_history = {starting_beam}
-    energised = [[False for col in range(len(input_data[0]))] for row in range(len(input_data))]
+    energised = [[False for col in range(input_data.width)] for row in range(input_data.height)]
 
     while beams:
         next_beams = []
@@ -46,8 +52,8 @@ def energised_tiles(input_data: InputType, starting_beam: Beam) -> int:
             target_row = beam.target_row()
             target_col = beam.target_col()
             # Only deal with beams that aren't leaving the contraption area.
-            if (0 <= target_row < len(input_data)) and (0 <= target_col < len(input_data[0])):
-                match input_data[target_row][target_col]:
+            if input_data.in_bounds(target_row, target_col):
+                match input_data[target_row, target_col]:
                     case ".":
                         next_beams.append(Beam(target_row, target_col, beam.direction))
                     case "/":
@@ -92,10 +98,14 @@ def part1(input_data: InputType) -> ResultType:
     return energised_tiles(input_data, Beam(0, -1, BeamDirection.RIGHT))
 
 
-def part2(input_data: InputType) -> ResultType:
-    with multiprocessing.Pool() as pool:
-        return max(pool.starmap(energised_tiles,
-                   [(input_data, Beam(row, col, direction)) for row in range(len(input_data))
-                    for col, direction in [(-1, BeamDirection.RIGHT), (len(input_data[0]), BeamDirection.LEFT)]] +
-                   [(input_data, Beam(row, col, direction)) for col in range(len(input_data[0]))
-                    for row, direction in [(-1, BeamDirection.DOWN), (len(input_data), BeamDirection.UP)]]))
+def part2(input_data: InputType, executor: "Executor | None" = None) -> ResultType:
+    if executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor() as executor:
+            return part2(input_data, executor)
+    starting_beams = [Beam(row, col, direction) for row in range(input_data.height)
+                      for col, direction in [(-1, BeamDirection.RIGHT), (input_data.width, BeamDirection.LEFT)]] + \
+                     [Beam(row, col, direction) for col in range(input_data.width)
+                      for row, direction in [(-1, BeamDirection.DOWN), (input_data.height, BeamDirection.UP)]]
+    return max(executor.map(energised_tiles, itertools.repeat(input_data), starting_beams,
+                            chunksize=max(1, len(starting_beams) // (4 * (os.cpu_count() or 1)))))
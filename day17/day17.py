@@ -5,13 +5,19 @@ import heapq
 from pathlib import Path
 import typing
 
-InputType = list[list[int]]
+from grid import Grid
+
+# Each cell is a single digit heat loss.
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [[int(c) for c in line.strip()] for line in f.readlines()]
+    return Grid.from_file(input_path)
+
+
+def heat_loss(input_data: InputType, row: int, col: int) -> int:
+    return input_data.byte(row, col) - ord("0")
 
 
 class Direction(IntEnum):
@@ -40,19 +46,18 @@ def min_heat_loss(input_data: InputType, start_pos: tuple[int, int], end_pos: tu
         Here we use Dijkstra's Algorithm starting at end_pos to calculate the minimum possible distance from each
         position to end_pos. If the crucibles had no constraints on their movement/turns, then this would be the
         actual distance to end_pos."""
-        result = [[None for col in range(len(input_data[0]))] for row in range(len(input_data))]
+        result = [[None for col in range(input_data.width)] for row in range(input_data.height)]
         # Heap of (distance, row, col).
         next_h_nodes: list[tuple[int, int, int]] = []
-        heapq.heappush(next_h_nodes, (0, len(input_data) - 1, len(input_data[0]) - 1))
+        heapq.heappush(next_h_nodes, (0, input_data.height - 1, input_data.width - 1))
         while next_h_nodes:
             dist, row, col = heapq.heappop(next_h_nodes)
             if result[row][col] is not None:
                 # Node already visited.
                 continue
             result[row][col] = dist
-            for next_row, next_col in [(row-1, col), (row+1, col), (row, col-1), (row, col+1)]:
-                if 0 <= next_row < len(result) and 0 <= next_col < len(result[0]):
-                    heapq.heappush(next_h_nodes, (dist + input_data[row][col], next_row, next_col))
+            for next_row, next_col in input_data.neighbours(row, col):
+                heapq.heappush(next_h_nodes, (dist + heat_loss(input_data, row, col), next_row, next_col))
         return result
     h_table = heuristic_table()
 
@@ -95,12 +100,12 @@ def min_heat_loss(input_data: InputType, start_pos: tuple[int, int], end_pos: tu
                 continue
             new_row = node.row + {Direction.UP: -1, Direction.RIGHT: 0, Direction.DOWN: 1, Direction.LEFT: 0}[d]
             new_col = node.col + {Direction.UP: 0, Direction.RIGHT: 1, Direction.DOWN: 0, Direction.LEFT: -1}[d]
-            if not (0 <= new_row < len(input_data) and 0 <= new_col < len(input_data[0])):
+            if not input_data.in_bounds(new_row, new_col):
                 # Can't go outside bounds of the city.
                 continue
 
             new_node = PathNode(new_row, new_col, d, new_move_length)
-            new_dist = dist + input_data[new_row][new_col]
+            new_dist = dist + heat_loss(input_data, new_row, new_col)
             heapq.heappush(next_nodes, (new_dist + h(new_row, new_col), new_dist, new_node))
 
     # Should have found a path to the end before running out of nodes.
@@ -108,8 +113,8 @@ def min_heat_loss(input_data: InputType, start_pos: tuple[int, int], end_pos: tu
 
 
 def part1(input_data: InputType) -> ResultType:
-    return min_heat_loss(input_data, (0, 0), (len(input_data)-1, len(input_data[0])-1), 1, 3)
+    return min_heat_loss(input_data, (0, 0), (input_data.height - 1, input_data.width - 1), 1, 3)
 
 
 def part2(input_data: InputType) -> ResultType:
-    return min_heat_loss(input_data, (0, 0), (len(input_data)-1, len(input_data[0])-1), 4, 10)
+    return min_heat_loss(input_data, (0, 0), (input_data.height - 1, input_data.width - 1), 4, 10)
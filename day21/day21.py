@@ -6,13 +6,14 @@ from enum import IntEnum
 from pathlib import Path
 from typing import Self
 
-InputType = list[str]
+from grid import Grid
+
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [line.strip() for line in f.readlines()]
+    return Grid.from_file(input_path)
 
 
 def part1(input_data: InputType, steps: int = 64) -> ResultType:
@@ -40,8 +41,8 @@ def part1(input_data: InputType, steps: int = 64) -> ResultType:
 
 
 def part2(input_data: InputType, steps: int = 26501365) -> ResultType:
-    tile_height = len(input_data)
-    tile_width = len(input_data[0])
+    tile_height = input_data.height
+    tile_width = input_data.width
 
     class CellState(IntEnum):
         # Never been ON.
@@ -231,10 +232,10 @@ def part2(input_data: InputType, steps: int = 26501365) -> ResultType:
             if "#" in input_data[row]:
                 return False
         for col in [0, tile_width // 2, tile_width - 1]:
-            if "#" in [row[col] for row in input_data]:
+            if "#" in input_data.column(col):
                 return False
         # Ensure that the starting tile is in the middle of the puzzle.
-        if input_data[tile_height // 2][tile_width // 2] != "S":
+        if input_data[tile_height // 2, tile_width // 2] != "S":
             return False
         # Ensure that puzzle_step_count % tile_width == tile_width / 2 - 0.5, as this ensures the points of the diamond
         # of resulting ON tiles will lie on the edges of their tiles, and all tiles will be one of:
@@ -4,41 +4,39 @@ import collections
 from enum import IntEnum
 from pathlib import Path
 
+from grid import Grid
+
 
 class Tile(IntEnum):
-    PATH = 0
-    FOREST = 1
-    SLOPE_UP = 2  # Not observed in inputs, but left here for completeness.
-    SLOPE_RIGHT = 3
-    SLOPE_DOWN = 4
-    SLOPE_LEFT = 5  # Not observed in inputs, but left here for completeness.
+    """Tile values are the bytes used for each tile in the input, so they can be compared to Grid.byte() directly."""
+    PATH = ord(".")
+    FOREST = ord("#")
+    SLOPE_UP = ord("^")  # Not observed in inputs, but left here for completeness.
+    SLOPE_RIGHT = ord(">")
+    SLOPE_DOWN = ord("v")
+    SLOPE_LEFT = ord("<")  # Not observed in inputs, but left here for completeness.
 
 
-InputType = list[list[Tile]]
+InputType = Grid
 ResultType = int
 
 
 def load(input_path: Path) -> InputType:
-    with open(input_path) as f:
-        return [[{".": Tile.PATH,
-                  "#": Tile.FOREST,
-                  "^": Tile.SLOPE_UP,
-                  ">": Tile.SLOPE_RIGHT,
-                  "v": Tile.SLOPE_DOWN,
-                  "<": Tile.SLOPE_LEFT
-                  }[c] for c in line.strip()] for line in f.readlines()]
+    return Grid.from_file(input_path)
 
 
 def find_entry_egress(input_data: InputType) -> tuple[tuple[int, int], tuple[int, int]]:
     """Find the entry and exit (called egress, to avoid clashing with the Python keyword) points of the map."""
     # Check that the map has only one entry and one egress.
-    assert all([r[0] == Tile.FOREST for r in input_data])
-    assert all([r[-1] == Tile.FOREST for r in input_data])
-    assert all([t in [Tile.PATH, Tile.FOREST] for t in input_data[0]]) and input_data[0].count(Tile.PATH) == 1
-    assert all([t in [Tile.PATH, Tile.FOREST] for t in input_data[-1]]) and input_data[-1].count(Tile.PATH) == 1
+    top_row = input_data.row_bytes(0)
+    bottom_row = input_data.row_bytes(-1)
+    assert all([input_data.byte(r, 0) == Tile.FOREST for r in range(input_data.height)])
+    assert all([input_data.byte(r, input_data.width - 1) == Tile.FOREST for r in range(input_data.height)])
+    assert all([t in [Tile.PATH, Tile.FOREST] for t in top_row]) and top_row.count(Tile.PATH) == 1
+    assert all([t in [Tile.PATH, Tile.FOREST] for t in bottom_row]) and bottom_row.count(Tile.PATH) == 1
 
-    entry = (0, input_data[0].index(Tile.PATH))
-    egress = (len(input_data) - 1, input_data[-1].index(Tile.PATH))
+    entry = (0, input_data.row_bytes(0).index(Tile.PATH))
+    egress = (input_data.height - 1, input_data.row_bytes(-1).index(Tile.PATH))
 
     return entry, egress
 
@@ -48,8 +46,8 @@ def build_graph(input_data: InputType) -> dict[tuple[int, int], list[tuple[tuple
     Returns a dictionary of graph edges, as {start_coordinates: [(end_coordinates, path_length)]}.
     Path length includes end point, but not start point."""
 
-    entry = (0, input_data[0].index(Tile.PATH))
-    egress = (len(input_data) - 1, input_data[-1].index(Tile.PATH))
+    entry = (0, input_data.row_bytes(0).index(Tile.PATH))
+    egress = (input_data.height - 1, input_data.row_bytes(-1).index(Tile.PATH))
 
     def downhill_pos(p: tuple[int, int]) -> tuple[int, int]:
         """For a tile at position p which is a slope, return the position of the downhill tile."""
@@ -57,7 +55,7 @@ def build_graph(input_data: InputType) -> dict[tuple[int, int], list[tuple[tuple
                 Tile.SLOPE_RIGHT: (p[0], p[1] + 1),
                 Tile.SLOPE_DOWN: (p[0] + 1, p[1]),
                 Tile.SLOPE_LEFT: (p[0], p[1] - 1)
-                }[input_data[p[0]][p[1]]]
+                }[input_data.byte(*p)]
 
     def trace_path(start: tuple[int, int]) -> tuple[tuple[int, int], int]:
         """Starting at coordinates start (either a slope, or the entry tile), trace the path to the next slope or to the
@@ -69,17 +67,16 @@ def build_graph(input_data: InputType) -> dict[tuple[int, int], list[tuple[tuple
              Tile.SLOPE_RIGHT: (start[0], start[1] + 1),
              Tile.SLOPE_DOWN: (start[0] + 1, start[1]),
              Tile.SLOPE_LEFT: (start[0], start[1] - 1)
-             }[input_data[start[0]][start[1]]]
+             }[input_data.byte(*start)]
 
         path_length = 2
 
-        while current_pos != egress and input_data[current_pos[0]][current_pos[1]] == Tile.PATH:
+        while current_pos != egress and input_data.byte(*current_pos) == Tile.PATH:
             next_pos = None
-            for next_r, next_c in [(current_pos[0] - 1, current_pos[1]), (current_pos[0] + 1, current_pos[1]),
-                                   (current_pos[0], current_pos[1] - 1), (current_pos[0], current_pos[1] + 1)]:
+            for next_r, next_c in input_data.neighbours(*current_pos):
                 if (next_r, next_c) == prev_pos:
                     continue
-                if input_data[next_r][next_c] != Tile.FOREST:
+                if input_data.byte(next_r, next_c) != Tile.FOREST:
                     # If next_pos not None, current_pos has an unexpected branching path.
                     # We expect all branches to be surrounded by slope tiles.
                     assert next_pos is None
@@ -108,12 +105,12 @@ def build_graph(input_data: InputType) -> dict[tuple[int, int], list[tuple[tuple
 
         for segment_start in [(node[0] - 1, node[1]), (node[0] + 1, node[1]),
                               (node[0], node[1] - 1), (node[0], node[1] + 1)]:
-            if input_data[segment_start[0]][segment_start[1]] != Tile.FOREST and \
+            if input_data.byte(*segment_start) != Tile.FOREST and \
                     downhill_pos(segment_start) != node:  # Only process outgoing paths.
                 # Detect adjacent nodes (only a single slope between them).
                 pos_after_start = downhill_pos(segment_start)
                 if pos_after_start != egress and \
-                        Tile.PATH not in [input_data[pos_after_start[0] + dr][pos_after_start[1] + dc]
+                        Tile.PATH not in [input_data.byte(pos_after_start[0] + dr, pos_after_start[1] + dc)
                                           for dr, dc in [(-1, 0), (1, 0), (0, -1), (0, 1)]]:
                     result[node].append((pos_after_start, 2))
                     to_process.add(pos_after_start)
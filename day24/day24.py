@@ -1,17 +1,20 @@
 #!/usr/bin/env python3
 
 import itertools
-import multiprocessing
+import os
 from pathlib import Path
 import re
-import sympy
-from sympy import Matrix
+import typing
 
-from .find_intersecting_line import *
+# sympy takes a long time to import, so it's only imported by the functions which use it.
+if typing.TYPE_CHECKING:
+    from concurrent.futures import Executor
+    from sympy import Matrix
+    from .find_intersecting_line import Line
 
 
 class Hailstone:
-    def __init__(self, pos: Matrix, vel: Matrix):
+    def __init__(self, pos: "Matrix", vel: "Matrix"):
         self.pos = pos
         self.vel = vel
 
@@ -21,6 +24,8 @@ ResultType = int
 
 
 def load(input_path: Path) -> InputType:
+    from sympy import Matrix
+
     line_regex = re.compile(r"^(-?\d+), +(-?\d+), +(-?\d+) +@ +(-?\d+), +(-?\d+), +(-?\d+)$")
     with open(input_path) as f:
         return [Hailstone(Matrix([int(match.group(1)), int(match.group(2)), int(match.group(3))]),
@@ -28,7 +33,9 @@ def load(input_path: Path) -> InputType:
                 for match in [line_regex.fullmatch(line.strip()) for line in f.readlines()]]
 
 
-def intersection_2d(h1: Hailstone, h2: Hailstone) -> Matrix | None:
+def intersection_2d(h1: Hailstone, h2: Hailstone) -> "Matrix | None":
+    import sympy
+
     # Find intersection by solving set of linear equations:
     # h1.x + h1.vx * t1 = h2.x + h2.vx * t2
     # h1.y + h1.vy * t1 = h2.y + h2.vy * t2
@@ -45,7 +52,7 @@ def intersection_2d(h1: Hailstone, h2: Hailstone) -> Matrix | None:
     if t[0,0] < 0 or t[1,0] < 0:
         # Intersection occurred in the past.
         return None
-    return Matrix([h1.pos[0,0] + h1.vel[0,0] * t[0,0], h1.pos[1,0] + h1.vel[1,0] * t[0,0]])
+    return sympy.Matrix([h1.pos[0,0] + h1.vel[0,0] * t[0,0], h1.pos[1,0] + h1.vel[1,0] * t[0,0]])
 
 
 def check_intersection(h1: Hailstone, h2: Hailstone, test_area_min: int, test_area_max: int):
@@ -57,16 +64,24 @@ def check_intersection(h1: Hailstone, h2: Hailstone, test_area_min: int, test_ar
 
 def part1(input_data: InputType,
           test_area_min: int = 200_000_000_000_000,
-          test_area_max: int = 400_000_000_000_000) -> ResultType:
+          test_area_max: int = 400_000_000_000_000,
+          executor: "Executor | None" = None) -> ResultType:
+    if executor is None:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor() as executor:
+            return part1(input_data, test_area_min, test_area_max, executor)
 
-    with multiprocessing.Pool() as pool:
-        return pool.starmap(check_intersection,
-                            [(h1, h2, test_area_min, test_area_max) for h1, h2 in itertools.combinations(input_data, 2)]
-                            ).count(True)
+    pairs = list(itertools.combinations(input_data, 2))
+    return list(executor.map(check_intersection, [h1 for h1, _ in pairs], [h2 for _, h2 in pairs],
+                             itertools.repeat(test_area_min), itertools.repeat(test_area_max),
+                             chunksize=max(1, len(pairs) // (4 * (os.cpu_count() or 1))))).count(True)
 
 
 def part2(input_data: InputType) -> ResultType:
-    def solve_for_l(l: Line) -> Matrix:
+    import sympy
+    from .find_intersecting_line import Line, find_intersecting_line
+
+    def solve_for_l(l: Line) -> sympy.Matrix:
         """With rock trajectory l, solve for rock initial position."""
 
         def intersection_3d(l: Line, h: Hailstone) -> sympy.core.numbers.Number:
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+
+from collections.abc import Iterator
+import copyreg
+import mmap
+from pathlib import Path
+from typing import Self
+
+
+def map_file(path: Path) -> bytes | mmap.mmap:
+    """
+    Return a read-only memory map of the file at path.
+    Files which can't be mapped, such as pipes, are read into bytes instead.
+    """
+    with open(path, "rb") as f:
+        if f.seekable():
+            if f.seek(0, 2) == 0:
+                # Empty files can't be memory mapped.
+                return b""
+            try:
+                # The map remains valid after the file is closed.
+                return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                f.seek(0)
+        return f.read()
+
+
+# Memory maps can't otherwise be pickled (or deep-copied), so pickle their contents as bytes. This lets mapped inputs be
+# cached, and sent to worker processes.
+copyreg.pickle(mmap.mmap, lambda m: (bytes, (m[:],)))
+
+
+class Grid:
+    """
+    A rectangular grid of single character cells, such as a puzzle input map with one row per line.
+
+    Cells are stored one byte each, in a single buffer (bytes, a bytearray, or a read-only memory map of the
+    input file). Row r starts at offset + r * stride, and each row is followed by its line ending, so the buffer of a
+    file can be used as-is without splitting it into lines.
+    """
+
+    def __init__(self, buffer: bytes | bytearray | mmap.mmap, width: int, height: int, stride: int | None = None,
+                 offset: int = 0):
+        self.buffer = buffer
+        self.width = width
+        self.height = height
+        self.stride = width + 1 if stride is None else stride
+        self.offset = offset
+        if height and offset + (height - 1) * self.stride + width > len(buffer):
+            raise ValueError("Grid extends past the end of its buffer.")
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes | bytearray | mmap.mmap, start: int = 0, end: int | None = None) -> Self:
+        """
+        Create a grid from the lines of text in buffer[start:end], without copying them.
+        Line endings may be either "\n" or "\r\n", and the last line need not have one.
+        """
+        end = len(buffer) if end is None else end
+        # Ignore trailing line endings.
+        while end > start and buffer[end - 1] in b"\r\n":
+            end -= 1
+        if end == start:
+            return cls(buffer, 0, 0, 1, start)
+        newline = buffer.find(b"\n", start, end)
+        if newline == -1:
+            return cls(buffer, end - start, 1, end - start + 1, start)
+        width = newline - start
+        stride = width + 1
+        if width and buffer[newline - 1] == ord("\r"):
+            width -= 1
+        height = (end - start + stride - width) // stride
+        if start + (height - 1) * stride + width != end:
+            raise ValueError("Grid rows are not all the same length.")
+        # Every row must be followed by the same line ending as the first, with no other line endings within rows.
+        line_ending = bytes(buffer[start + width:start + stride])
+        for row_start in range(start, end, stride):
+            row_end = row_start + width
+            if buffer.find(b"\n", row_start, row_end) != -1 or \
+                    (row_end != end and buffer[row_end:row_start + stride] != line_ending):
+                raise ValueError("Grid rows are not all the same length.")
+        return cls(buffer, width, height, stride, start)
+
+    @classmethod
+    def from_file(cls, path: Path) -> Self:
+        """Create a grid backed by a read-only memory map of the file at path."""
+        return cls.from_buffer(map_file(path))
+
+    def __reduce__(self):
+        # Memory maps can't be pickled, so pickle (and deepcopy) only the cells, as bytes.
+        return self.__class__, (b"".join(self.row_bytes(row) for row in range(self.height)), self.width, self.height,
+                                self.width)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.height}x{self.width})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return (self.width, self.height) == (other.width, other.height) and \
+            all(self.row_bytes(row) == other.row_bytes(row) for row in range(self.height))
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __iter__(self) -> Iterator[str]:
+        for row in range(self.height):
+            yield self[row]
+
+    def in_bounds(self, row: int, col: int) -> bool:
+        return 0 <= row < self.height and 0 <= col < self.width
+
+    def index(self, row: int, col: int) -> int:
+        """Return the offset in buffer of the cell at row, col, raising IndexError if it's outside the grid."""
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise IndexError(f"Cell {(row, col)} outside {self.height}x{self.width} grid.")
+        return self.offset + row * self.stride + col
+
+    def position(self, index: int) -> tuple[int, int]:
+        """Inverse of index()."""
+        return divmod(index - self.offset, self.stride)
+
+    def row_bytes(self, row: int) -> bytes:
+        """Return the cells of a row as bytes. Negative rows count from the bottom of the grid, as for lists."""
+        if row < 0:
+            row += self.height
+        if not 0 <= row < self.height:
+            raise IndexError(f"Row {row} outside {self.height}x{self.width} grid.")
+        start = self.offset + row * self.stride
+        return bytes(self.buffer[start:start + self.width])
+
+    def __getitem__(self, key: int | tuple[int, int | slice]) -> str:
+        """
+        grid[row] returns a row as a string.
+        grid[row, col] returns a single cell, and grid[row, start:end] a range of cells in a row.
+        """
+        if not isinstance(key, tuple):
+            return self.row_bytes(key).decode("latin-1")
+        row, col = key
+        if isinstance(col, slice):
+            start, stop, step = col.indices(self.width)
+            if not 0 <= row < self.height:
+                raise IndexError(f"Row {row} outside {self.height}x{self.width} grid.")
+            base = self.offset + row * self.stride
+            return bytes(self.buffer[base + start:base + max(start, stop):step]).decode("latin-1")
+        return chr(self.buffer[self.index(row, col)])
+
+    def byte(self, row: int, col: int) -> int:
+        """Return the value of a single cell as an int, avoiding the creation of a string."""
+        return self.buffer[self.index(row, col)]
+
+    def column(self, col: int) -> str:
+        if not 0 <= col < self.width:
+            raise IndexError(f"Column {col} outside {self.height}x{self.width} grid.")
+        start = self.offset + col
+        return bytes(self.buffer[start:start + self.height * self.stride:self.stride]).decode("latin-1")
+
+    def columns(self) -> list[str]:
+        """Return all columns of the grid as strings, i.e. the rows of its transpose."""
+        return [self.column(col) for col in range(self.width)]
+
+    def neighbours(self, row: int, col: int) -> Iterator[tuple[int, int]]:
+        """Yield the positions of the cells above, below, left and right of row, col that are within the grid."""
+        if row > 0:
+            yield row - 1, col
+        if row + 1 < self.height:
+            yield row + 1, col
+        if col > 0:
+            yield row, col - 1
+        if col + 1 < self.width:
+            yield row, col + 1
+
+    def find_all(self, char: str) -> Iterator[tuple[int, int]]:
+        """Yield the position of every cell containing char, in row-major order."""
+        value = char.encode("latin-1")
+        end = self.offset + self.height * self.stride
+        i = self.buffer.find(value, self.offset, end)
+        while i != -1:
+            row, col = self.position(i)
+            # Skip matches in line endings.
+            if col < self.width:
+                yield row, col
+            i = self.buffer.find(value, i + 1, end)
+
+    def find(self, char: str) -> tuple[int, int] | None:
+        """Return the position of the first cell containing char, or None if there isn't one."""
+        return next(self.find_all(char), None)
+
+    def count(self, char: str) -> int:
+        return sum(1 for _ in self.find_all(char))
@@ -7,57 +7,136 @@
 #     pytest -k day01             # Run all tests from day01
 #     pytest -k "day01 and part1" # Run tests for first part of day01
 #     pytest -k main              # Only run actual puzzles, not test inputs
+#     pytest --result-cache       # Skip puzzles which haven't changed since they were last run
+#     pytest -k stream            # Only run puzzles with streamed input
+#     pytest --time-limit 10      # Fail puzzles which take longer than 10 seconds, rather than waiting for them
+#     pytest --memory-limit 2048  # Fail puzzles which use more than 2 GiB of address space
 
 import aoc2023
 
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor
 from pathlib import Path
-import re
-
-
-def try_convert_int(s: str) -> int | str:
-    """If s contains only digits, return the integer it represents, otherwise just return s."""
-    if s.isdigit():
-        return int(s)
-    return s
+import pytest
 
 
 def pytest_generate_tests(metafunc):
-    if metafunc.function == test:
-        top_dir = Path(__file__).resolve().parent
-        day_regex = re.compile(r"day(\d{2})")
-        sample_regex = re.compile(r"sample\d+")
-
+    if metafunc.function in (test, test_stream):
         # Dictionary from test_identifier to tuple of test arguments.
         tests: dict[str, tuple[int, Path, bool, int | str, dict[str, int | str]]] = {}
 
-        for day_dir in sorted(top_dir.iterdir()):
-            if day_match := day_regex.fullmatch(day_dir.name):
-                day = int(day_match.group(1))
-                data_dir = day_dir / "data"
-
-                test_inputs = sorted([p for p in data_dir.iterdir() if sample_regex.fullmatch(p.name)]) + \
-                    [data_dir / "input"]
-                for test_input in test_inputs:
-                    for part in [1, 2]:
-                        answer_file = test_input.parent / f"{test_input.name}.answer{part}"
-                        if answer_file.exists():
-                            input_name = "main" if test_input.name == "input" else test_input.name
-                            with open(answer_file) as f:
-                                for answer_line in f.readlines():
-                                    answer_line = answer_line.strip()
-                                    if ": " in answer_line:
-                                        extra_args = {extra_arg.split("=")[0]: try_convert_int(extra_arg.split("=")[1]) for extra_arg in answer_line.split(": ")[0].split(",")}
-                                        answer = answer_line.split(": ")[1]
-                                    else:
-                                        extra_args = {}
-                                        answer = answer_line
-                                    answer = try_convert_int(answer)
-                                    tests[f"day{day:02} part{part}: {input_name}" + (" " + str(extra_args) if extra_args else "")] = (day, test_input, part == 1, answer, extra_args)
+        for day in aoc2023.find_days():
+            if metafunc.function == test_stream and not hasattr(aoc2023.import_day(day), "iter_load"):
+                continue
+            for test_input in aoc2023.find_inputs(day):
+                for part in [1, 2]:
+                    for extra_args, answer in aoc2023.find_answers(test_input, part == 1):
+                        tests[aoc2023.case_name(day, test_input, part == 1, extra_args)] = \
+                            (day, test_input, part == 1, answer, extra_args)
 
         arguments = tests.items()
         metafunc.parametrize(["day", "input_path", "part1", "answer", "extra_args"], [arg[1] for arg in arguments],
             ids=[arg[0] for arg in arguments])
 
 
-def test(day: int, input_path: Path, part1: bool, answer: int | str, extra_args: dict[str, int | str]) -> None:
-    assert aoc2023.run_puzzle(day, input_path, part1, **extra_args) == answer
+@pytest.fixture(scope="session")
+def budget(pytestconfig: pytest.Config) -> dict[str, float | int | None]:
+    """Time and memory limits for each puzzle, as keyword arguments for aoc2023.run_puzzle()."""
+    memory_limit = pytestconfig.getoption("memory_limit")
+    return {"time_limit": pytestconfig.getoption("time_limit"),
+            "memory_limit": None if memory_limit is None else int(memory_limit * 1024 * 1024)}
+
+
+@pytest.fixture(scope="session")
+def executor() -> Iterator[Executor]:
+    """Worker pool shared by all tests, for puzzles which run parallel tasks."""
+    with ProcessPoolExecutor() as shared_executor:
+        yield shared_executor
+
+
+def test(day: int, input_path: Path, part1: bool, answer: int | str, extra_args: dict[str, int | str],
+         executor: Executor, budget: dict[str, float | int | None], pytestconfig: pytest.Config) -> None:
+    try:
+        result = aoc2023.run_puzzle(day, input_path, part1, executor, pytestconfig.getoption("result_cache"),
+                                    **budget, **extra_args)
+    except aoc2023.BudgetExceeded as e:
+        pytest.fail(str(e), pytrace=False)
+    assert result == answer
+
+
+def test_stream(day: int, input_path: Path, part1: bool, answer: int | str, extra_args: dict[str, int | str],
+                executor: Executor, budget: dict[str, float | int | None]) -> None:
+    """Same as test(), but reading input through the day's iter_load() generator."""
+    try:
+        result = aoc2023.run_puzzle(day, input_path, part1, executor, stream=True, **budget, **extra_args)
+    except aoc2023.BudgetExceeded as e:
+        pytest.fail(str(e), pytrace=False)
+    assert result == answer
+
+
+def existing_inputs(day: int) -> list[Path]:
+    """All of a day's inputs which are present, to check alternative code paths against each other."""
+    return [p for p in aoc2023.find_inputs(day) if p.exists()]
+
+
+@pytest.mark.parametrize("input_path", existing_inputs(1), ids=lambda p: p.name)
+def test_day01_numpy(input_path: Path) -> None:
+    """The NumPy path is only used for inputs of megabytes, so call it directly and compare with the regex path."""
+    day01 = aoc2023.import_day(1)
+    input_data = day01.load(input_path)
+    assert day01.total_calibration_value_numpy(input_data) == day01.CalibrationReader({}).total(input_data)
+    assert day01.total_calibration_value_numpy(b"") == day01.total_calibration_value_numpy(b"abc\ndef\n") == 0
+
+
+@pytest.mark.parametrize("input_path", existing_inputs(4), ids=lambda p: p.name)
+def test_day04_card_table(input_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Force the NumPy CardTable even for small inputs, and compare with the list of cards."""
+    day04 = aoc2023.import_day(4)
+    cards = day04.load(input_path)
+    monkeypatch.setattr(day04, "numpy_min_cards", 1)
+    table = day04.load(input_path)
+    assert isinstance(table, day04.CardTable)
+    assert day04.match_counts(table) == list(day04.match_counts(cards))
+    assert day04.part1(table) == day04.part1(cards)
+    assert day04.part2(table) == day04.part2(cards)
+
+
+@pytest.mark.parametrize("input_path", existing_inputs(5), ids=lambda p: p.name)
+def test_day05_seed_locations(input_path: Path) -> None:
+    """The NumPy lookup is only used for huge numbers of seeds, so compare it with looking up one seed at a time."""
+    day05 = aoc2023.import_day(5)
+    seeds, maps = day05.load(input_path)
+    # Also look up the seeds either side of the edges of every mapping's source range.
+    edges = {x for _, _, mappings in maps for _, source, length in mappings
+             for x in (source - 1, source, source + length - 1, source + length) if x >= 0}
+    for input_data in (seeds, maps), (sorted(edges), maps):
+        seed_to_location = day05.seed_to_location_map(input_data)
+        assert day05.seed_locations(input_data).tolist() == [seed_to_location(seed) for seed in input_data[0]]
+
+
+@pytest.mark.parametrize("input_path", existing_inputs(9), ids=lambda p: p.name)
+def test_day09_extrapolate(input_path: Path) -> None:
+    """
+    Compare extrapolating several steps at once with extrapolating one step at a time, and extrapolating all sequences
+    at once with NumPy with extrapolating each one, in both directions.
+    """
+    day09 = aoc2023.import_day(9)
+    sequences = day09.load(input_path)
+    for sequence in sequences:
+        forwards, backwards = list(sequence), list(sequence)
+        for steps in range(1, 4):
+            forwards.append(day09.extrapolate(forwards))
+            backwards.insert(0, day09.extrapolate(backwards, -1))
+            assert day09.extrapolate(sequence, steps) == forwards[-1]
+            assert day09.extrapolate(sequence, -steps) == backwards[0]
+
+    by_length: dict[int, list[list[int]]] = {}
+    for sequence in sequences:
+        by_length.setdefault(len(sequence), []).append(sequence)
+    for group in by_length.values():
+        # Scaled up, the results overflow 64 bits, and then so do the sequences themselves.
+        for scale in (1, 10 ** 15, 10 ** 30):
+            scaled = [[x * scale for x in sequence] for sequence in group]
+            for steps in range(-3, 4):
+                assert day09.extrapolate_all(scaled, steps).tolist() == \
+                    [day09.extrapolate(sequence, steps) for sequence in scaled]